@@ -0,0 +1,175 @@
+from typing import List, Dict, Any, Optional, Tuple, Union
+from datetime import datetime
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+Timestamp = Union[int, float, str, datetime]
+
+# Above this many lags the FFT path beats the direct shifted-matrix product
+FFT_LAG_THRESHOLD = 32
+
+def to_epoch(value: Timestamp) -> float:
+    """Convert an epoch number, ISO-8601 string or datetime to epoch seconds"""
+    if isinstance(value, (int, float, np.number)):
+        return float(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return value.timestamp()
+
+def parse_series(raw: Any) -> Tuple[np.ndarray, np.ndarray]:
+    """Parse a dashboard series into (timestamps, values) arrays.
+
+    Accepts ``{"timestamps": [...], "values": [...]}``, a list of
+    ``[timestamp, value]`` pairs or a list of ``{"timestamp", "value"}`` dicts.
+    Null points become NaN; ``CorrelationEngine.align`` drops them.
+    """
+    if isinstance(raw, dict):
+        timestamps, values = raw.get("timestamps", []), raw.get("values", [])
+    elif raw and isinstance(raw[0], dict):
+        timestamps = [point["timestamp"] for point in raw]
+        values = [point["value"] for point in raw]
+    else:
+        timestamps = [point[0] for point in raw]
+        values = [point[1] for point in raw]
+
+    timestamps = np.asarray(timestamps)
+    if timestamps.dtype.kind not in "iuf":
+        timestamps = np.array(
+            [to_epoch(ts) if ts is not None else np.nan for ts in timestamps], dtype=np.float64
+        )
+    return timestamps.astype(np.float64), np.asarray(values, dtype=np.float64)
+
+class CorrelationEngine:
+    """Lagged cross-correlation of many metric series against an incident.
+
+    All series are resampled onto one time grid around the incident start and
+    correlated against a reference signal (a step at the incident start, or a
+    named series) for every lag in ``[-max_lag, max_lag]`` at once. A positive
+    lag means the series moves *after* the reference.
+    """
+
+    def __init__(
+        self,
+        step_seconds: float = 60.0,
+        lookback_seconds: float = 3600.0,
+        lookahead_seconds: float = 1800.0,
+        max_lag: int = 10,
+        top_k: int = 10
+    ):
+        self.step_seconds = step_seconds
+        self.lookback_seconds = lookback_seconds
+        self.lookahead_seconds = lookahead_seconds
+        self.max_lag = max_lag
+        self.top_k = top_k
+
+    def align(
+        self,
+        series: Dict[str, Tuple[np.ndarray, np.ndarray]],
+        start: float,
+        end: float
+    ) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Resample series onto a common grid, returning (names, grid, matrix)"""
+        grid = np.arange(start, end + self.step_seconds / 2, self.step_seconds)
+        names = []
+        matrix = np.empty((len(series), len(grid)), dtype=np.float64)
+        for name, (timestamps, values) in series.items():
+            # Gaps (null/NaN points) would turn the whole interpolated row into NaN
+            finite = np.isfinite(timestamps) & np.isfinite(values)
+            if not finite.all():
+                timestamps, values = timestamps[finite], values[finite]
+            if len(timestamps) < 2:
+                continue
+            if len(timestamps) > 1 and np.any(np.diff(timestamps) < 0):
+                order = np.argsort(timestamps, kind="stable")
+                timestamps, values = timestamps[order], values[order]
+            matrix[len(names)] = np.interp(grid, timestamps, values)
+            names.append(name)
+        return names, grid, matrix[:len(names)]
+
+    def cross_correlate(self, matrix: np.ndarray, reference: np.ndarray) -> np.ndarray:
+        """Pearson correlation of each row with ``reference`` at every lag.
+
+        Returns an array of shape ``(n_series, 2 * max_lag + 1)``; column
+        ``max_lag + lag`` holds the correlation at ``lag``.
+        """
+        n_points = matrix.shape[1]
+        max_lag = min(self.max_lag, n_points - 1)
+
+        x = self._standardize(matrix)
+        r = self._standardize(reference[np.newaxis, :])[0]
+
+        if 2 * max_lag + 1 > FFT_LAG_THRESHOLD:
+            n_fft = 1 << int(np.ceil(np.log2(2 * n_points - 1)))
+            spectrum = np.fft.rfft(x, n_fft, axis=1) * np.conj(np.fft.rfft(r, n_fft))
+            full = np.fft.irfft(spectrum, n_fft, axis=1)
+            # Circular layout: lag 0..max_lag at the front, negative lags at the back
+            lagged = np.concatenate(
+                [full[:, n_fft - max_lag:], full[:, :max_lag + 1]], axis=1
+            )
+        else:
+            shifted = np.zeros((n_points, 2 * max_lag + 1), dtype=np.float64)
+            for column, lag in enumerate(range(-max_lag, max_lag + 1)):
+                if lag >= 0:
+                    shifted[lag:, column] = r[:n_points - lag]
+                else:
+                    shifted[:lag, column] = r[-lag:]
+            lagged = x @ shifted
+
+        lagged /= n_points
+        if max_lag < self.max_lag:
+            pad = self.max_lag - max_lag
+            lagged = np.pad(lagged, ((0, 0), (pad, pad)))
+        return lagged
+
+    def correlate_incident(
+        self,
+        series: Dict[str, Tuple[np.ndarray, np.ndarray]],
+        incident_start: Timestamp,
+        reference: Optional[str] = None,
+        top_k: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Return the series most correlated with the incident, strongest first"""
+        start = to_epoch(incident_start)
+        names, grid, matrix = self.align(
+            series, start - self.lookback_seconds, start + self.lookahead_seconds
+        )
+        if not names or len(grid) < 2:
+            return []
+
+        if reference is not None and reference in names:
+            ref_index = names.index(reference)
+            ref_signal = matrix[ref_index]
+            names = names[:ref_index] + names[ref_index + 1:]
+            matrix = np.delete(matrix, ref_index, axis=0)
+            if not names:
+                return []
+        else:
+            ref_signal = (grid >= start).astype(np.float64)
+
+        lagged = self.cross_correlate(matrix, ref_signal)
+        best_column = np.abs(lagged).argmax(axis=1)
+        best = lagged[np.arange(len(names)), best_column]
+
+        k = min(top_k or self.top_k, len(names))
+        top = np.argpartition(-np.abs(best), k - 1)[:k]
+        top = top[np.argsort(-np.abs(best[top]), kind="stable")]
+
+        return [
+            {
+                "series": names[i],
+                "correlation": round(float(best[i]), 4),
+                "lag_seconds": float((best_column[i] - self.max_lag) * self.step_seconds),
+                "zero_lag_correlation": round(float(lagged[i, self.max_lag]), 4)
+            }
+            for i in top
+        ]
+
+    @staticmethod
+    def _standardize(matrix: np.ndarray) -> np.ndarray:
+        centered = matrix - matrix.mean(axis=1, keepdims=True)
+        std = centered.std(axis=1, keepdims=True)
+        # Flat series carry no signal; leave them at zero correlation
+        std[std == 0] = np.inf
+        return centered / std
@@ -0,0 +1,265 @@
+from typing import List, Dict, Any, Optional, Tuple
+from collections import OrderedDict
+import hashlib
+import logging
+import re
+import time
+import numpy as np
+from .correlation_engine import to_epoch
+
+logger = logging.getLogger(__name__)
+
+SIMHASH_BITS = 64
+MAX_GROUP_KEYS = 32
+MAX_GROUP_MEMBERS = 1000
+MAX_SCOPE_GROUPS = 64
+
+# Volatile tokens that differ between otherwise identical alerts
+_NORMALIZERS = [
+    (re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b"), " <uuid> "),
+    (re.compile(r"\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b"), " <ip> "),
+    (re.compile(r"\b\d{4}-\d{2}-\d{2}[t ]\d{2}:\d{2}:\d{2}(?:\.\d+)?z?\b"), " <ts> "),
+    (re.compile(r"\b0x[0-9a-f]+\b|\b[0-9a-f]{12,}\b"), " <hex> "),
+    (re.compile(r"\d+(?:\.\d+)?"), " <num> "),
+    (re.compile(r"[^\w<>]+"), " "),
+]
+
+def normalize_text(text: str) -> str:
+    """Lower-case text and mask ids, addresses, timestamps and numbers"""
+    text = text.lower()
+    for pattern, replacement in _NORMALIZERS:
+        text = pattern.sub(replacement, text)
+    return " ".join(text.split())
+
+class IncidentGroup:
+    """Near-duplicate incidents represented by the first one seen"""
+
+    def __init__(self, group_id: str, representative: Dict[str, Any], scope: str, fingerprint: int, seen_at: float):
+        self.group_id = group_id
+        self.representative = representative
+        self.scope = scope
+        self.fingerprint = fingerprint
+        self.first_seen = seen_at
+        self.last_seen = seen_at
+        self.count = 1
+        self.member_ids: List[str] = []
+        self.tokens: frozenset = frozenset()
+        self.analysis: Optional[List[Dict[str, Any]]] = None
+        # Set by the analyzer while the representative is being analyzed, so
+        # duplicates arriving in the meantime can wait for its results
+        self.analysis_ready: Optional[Any] = None
+        # LLM analyses of the group by data type, as futures shared by duplicates
+        self.llm_analyses: Dict[str, Any] = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "group_id": self.group_id,
+            "representative_id": self.representative.get("id"),
+            "count": self.count,
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen
+        }
+
+class AlertDeduplicator:
+    """Group near-duplicate incidents within a sliding time window.
+
+    Incidents are fingerprinted with a 64-bit SimHash of their normalized text
+    and indexed by LSH banding: the fingerprint is split into ``bands`` chunks,
+    so any two fingerprints within ``max_distance`` bits share at least one
+    chunk whenever ``max_distance < bands``. Candidates from matching buckets
+    are confirmed by Hamming distance. Short texts move many fingerprint bits
+    per changed word, so when banding finds nothing the most recent groups in
+    the same scope are compared by token Jaccard similarity against
+    ``min_similarity`` instead. Incidents only group when their
+    normalized ``scope_fields`` match exactly, and groups idle for longer than
+    ``window_seconds`` are evicted.
+
+    The title is part of the scope by default: on short alert text a single
+    identifying token (a cluster or host name) moves the fingerprint by only
+    a few bits, so SimHash alone would merge alerts about different targets.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 900.0,
+        max_distance: int = 3,
+        bands: int = 4,
+        fields: Tuple[str, ...] = ("description",),
+        scope_fields: Tuple[str, ...] = ("title", "severity", "affected_services"),
+        min_similarity: float = 0.8,
+        token_cache_size: int = 100000
+    ):
+        if SIMHASH_BITS % bands:
+            raise ValueError(f"bands must divide {SIMHASH_BITS}")
+        self.window_seconds = window_seconds
+        self.max_distance = max_distance
+        self.bands = bands
+        self.band_bits = SIMHASH_BITS // bands
+        self.fields = fields
+        self.scope_fields = scope_fields
+        self.min_similarity = min_similarity
+        self.token_cache_size = token_cache_size
+
+        self.groups: "OrderedDict[str, IncidentGroup]" = OrderedDict()
+        self._exact: Dict[str, str] = {}
+        self._group_keys: Dict[str, List[str]] = {}
+        self._buckets: List[Dict[Tuple[str, int], List[str]]] = [{} for _ in range(bands)]
+        self._scope_groups: Dict[str, List[str]] = {}
+        self._members: Dict[str, str] = {}
+        self._token_vectors: Dict[str, np.ndarray] = {}
+        self._weights = 1 << np.arange(SIMHASH_BITS, dtype=np.uint64)
+        self._next_id = 0
+
+    def ingest(self, incident: Dict[str, Any]) -> Tuple[IncidentGroup, bool]:
+        """Assign an incident to a group; returns (group, is_new_group)"""
+        seen_at = self._seen_at(incident)
+        self._evict(seen_at)
+
+        scope = self._incident_text(incident, self.scope_fields)
+        text = self._incident_text(incident, self.fields)
+        key = f"{scope}|{text}"
+
+        group_id = self._exact.get(key)
+        if group_id is None:
+            fingerprint = self._simhash(text)
+            group_id = self._find_similar(scope, fingerprint, text)
+        if group_id is not None:
+            group = self.groups[group_id]
+            group.count += 1
+            group.last_seen = max(group.last_seen, seen_at)
+            self._add_member(group, incident)
+            if key not in self._exact and len(self._group_keys[group_id]) < MAX_GROUP_KEYS:
+                # Remember the variant so repeats skip the SimHash path
+                self._exact[key] = group_id
+                self._group_keys[group_id].append(key)
+            self.groups.move_to_end(group_id)
+            return group, False
+
+        group = self._create_group(incident, key, scope, fingerprint, seen_at)
+        return group, True
+
+    def group_of(self, incident_id: Any) -> Optional[IncidentGroup]:
+        """Return the active group an already ingested incident belongs to"""
+        if incident_id is None:
+            return None
+        group_id = self._members.get(str(incident_id))
+        return self.groups.get(group_id) if group_id is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active_groups": len(self.groups),
+            "grouped_incidents": sum(group.count for group in self.groups.values())
+        }
+
+    def _seen_at(self, incident: Dict[str, Any]) -> float:
+        timestamp = incident.get("timestamp")
+        if timestamp is None:
+            return time.time()
+        try:
+            return to_epoch(timestamp)
+        except (TypeError, ValueError):
+            return time.time()
+
+    def _incident_text(self, incident: Dict[str, Any], fields: Tuple[str, ...]) -> str:
+        parts = []
+        for field in fields:
+            value = incident.get(field)
+            if isinstance(value, (list, tuple)):
+                parts.append(" ".join(sorted(str(item) for item in value)))
+            elif value is not None:
+                parts.append(str(value))
+        return normalize_text(" ".join(parts))
+
+    def _token_vector(self, token: str) -> np.ndarray:
+        vector = self._token_vectors.get(token)
+        if vector is None:
+            digest = int.from_bytes(
+                hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little"
+            )
+            bits = (digest >> np.arange(SIMHASH_BITS, dtype=np.uint64)) & np.uint64(1)
+            vector = bits.astype(np.int32) * 2 - 1
+            if len(self._token_vectors) >= self.token_cache_size:
+                self._token_vectors.clear()
+            self._token_vectors[token] = vector
+        return vector
+
+    def _simhash(self, text: str) -> int:
+        tokens = text.split()
+        # Word bigrams keep some ordering information
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        if not features:
+            return 0
+        totals = np.sum([self._token_vector(feature) for feature in features], axis=0)
+        return int(self._weights[totals > 0].sum())
+
+    def _band_keys(self, scope: str, fingerprint: int) -> List[Tuple[str, int]]:
+        mask = (1 << self.band_bits) - 1
+        return [(scope, (fingerprint >> (band * self.band_bits)) & mask) for band in range(self.bands)]
+
+    def _find_similar(self, scope: str, fingerprint: int, text: str) -> Optional[str]:
+        best_id, best_distance = None, self.max_distance + 1
+        for band, band_key in enumerate(self._band_keys(scope, fingerprint)):
+            for group_id in self._buckets[band].get(band_key, ()):
+                distance = bin(self.groups[group_id].fingerprint ^ fingerprint).count("1")
+                if distance < best_distance:
+                    best_id, best_distance = group_id, distance
+        if best_id is not None:
+            return best_id
+
+        tokens = frozenset(text.split())
+        best_similarity = self.min_similarity
+        for group_id in reversed(self._scope_groups.get(scope, ())):
+            group_tokens = self.groups[group_id].tokens
+            union = len(tokens | group_tokens)
+            similarity = len(tokens & group_tokens) / union if union else 1.0
+            if similarity >= best_similarity:
+                best_id, best_similarity = group_id, similarity
+        return best_id
+
+    def _create_group(self, incident: Dict[str, Any], key: str, scope: str, fingerprint: int, seen_at: float) -> IncidentGroup:
+        self._next_id += 1
+        group_id = f"grp_{self._next_id}"
+        group = IncidentGroup(group_id, incident, scope, fingerprint, seen_at)
+        group.tokens = frozenset(key[len(scope) + 1:].split())
+        self._add_member(group, incident)
+
+        self.groups[group_id] = group
+        self._exact[key] = group_id
+        self._group_keys[group_id] = [key]
+        for band, band_key in enumerate(self._band_keys(scope, fingerprint)):
+            self._buckets[band].setdefault(band_key, []).append(group_id)
+        scope_groups = self._scope_groups.setdefault(scope, [])
+        scope_groups.append(group_id)
+        if len(scope_groups) > MAX_SCOPE_GROUPS:
+            del scope_groups[0]
+        return group
+
+    def _add_member(self, group: IncidentGroup, incident: Dict[str, Any]):
+        if incident.get("id") is not None and len(group.member_ids) < MAX_GROUP_MEMBERS:
+            group.member_ids.append(str(incident["id"]))
+            self._members[str(incident["id"])] = group.group_id
+
+    def _evict(self, now: float):
+        cutoff = now - self.window_seconds
+        while self.groups:
+            group_id, group = next(iter(self.groups.items()))
+            if group.last_seen >= cutoff:
+                break
+            del self.groups[group_id]
+            for key in self._group_keys.pop(group_id):
+                if self._exact.get(key) == group_id:
+                    del self._exact[key]
+            for band, band_key in enumerate(self._band_keys(group.scope, group.fingerprint)):
+                bucket = self._buckets[band].get(band_key)
+                if bucket is not None:
+                    bucket.remove(group_id)
+                    if not bucket:
+                        del self._buckets[band][band_key]
+            scope_groups = self._scope_groups.get(group.scope)
+            if scope_groups is not None and group_id in scope_groups:
+                scope_groups.remove(group_id)
+                if not scope_groups:
+                    del self._scope_groups[group.scope]
+            for member_id in group.member_ids:
+                if self._members.get(member_id) == group_id:
+                    del self._members[member_id]
@@ -1,11 +1,37 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import asyncio
 import json
 import logging
 from datetime import datetime
 from pydantic import BaseModel
+from .correlation_engine import CorrelationEngine, parse_series
+from .deduplication import AlertDeduplicator, normalize_text
+from .memory import AgentMemory
 
 logger = logging.getLogger(__name__)
 
+# The incident field each role analyzes; other roles use the whole incident
+ROLE_INPUTS = {"LogAnalyzer": "logs", "MetricAnalyzer": "metrics"}
+# Keys whose values change between recurrences of the same incident
+VOLATILE_KEYS = {"id", "timestamp", "timestamps", "time", "created_at", "updated_at"}
+
+def content_lines(value: Any) -> List[str]:
+    """Flatten incident data to sorted, de-duplicated normalized lines.
+
+    Volatile keys are dropped and ``normalize_text`` masks numbers, ids and
+    timestamps, so a recurrence of the same incident yields the same lines.
+    """
+    if isinstance(value, dict):
+        parts = [
+            f"{key} {' '.join(content_lines(item))}"
+            for key, item in sorted(value.items())
+            if key not in VOLATILE_KEYS
+        ]
+        return [normalize_text(" ".join(parts))]
+    if isinstance(value, (list, tuple)):
+        return sorted({line for item in value for line in content_lines(item)})
+    return [normalize_text(str(value))] if value is not None else []
+
 class AgentRole(BaseModel):
     name: str
     description: str
@@ -18,12 +44,13 @@ class Agent(BaseModel):
     last_active: datetime
 
 class IncidentAgent:
-    def __init__(self, agent_id: str, role: AgentRole):
+    def __init__(self, agent_id: str, role: AgentRole, memory: Optional[AgentMemory] = None):
         self.agent_id = agent_id
         self.role = role
         self.status = "active"
         self.last_active = datetime.utcnow()
-        self.memory = []
+        self.memory = memory if memory is not None else AgentMemory()
+        self.correlation_engine = CorrelationEngine()
 
     async def analyze_incident(self, incident_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
@@ -31,16 +58,37 @@ class IncidentAgent:
             self.status = "analyzing"
             self.last_active = datetime.utcnow()
 
+            # Reuse a prior analysis of a recurring incident when one is close enough
+            memory_text = self._memory_text(incident_data)
+            memory_key = self._memory_key(incident_data)
+            reusable = bool(memory_text) and memory_key is not None
+            recalled = self.memory.recall(memory_text, key=memory_key) if reusable else None
+            if recalled is not None:
+                self.status = "active"
+                return {
+                    "agent_id": self.agent_id,
+                    "role": self.role.name,
+                    "analysis": recalled.analysis,
+                    "reused_from": recalled.incident_id,
+                    "timestamp": datetime.utcnow().isoformat()
+                }
+
             # Analyze based on role
             if self.role.name == "LogAnalyzer":
                 analysis = await self._analyze_logs(incident_data.get("logs", []))
             elif self.role.name == "MetricAnalyzer":
                 analysis = await self._analyze_metrics(incident_data.get("metrics", []))
             elif self.role.name == "DashboardAnalyzer":
-                analysis = await self._analyze_dashboard(incident_data.get("dashboard_data", {}))
+                dashboard_data = dict(incident_data.get("dashboard_data") or {})
+                dashboard_data.setdefault("incident_id", incident_data.get("id"))
+                dashboard_data.setdefault("incident_start", incident_data.get("timestamp"))
+                analysis = await self._analyze_dashboard(dashboard_data)
             else:
                 analysis = await self._general_analysis(incident_data)
 
+            if reusable:
+                self.memory.add(memory_text, analysis, incident_id=incident_data.get("id"), key=memory_key)
+
             # Update agent status
             self.status = "active"
             self.last_active = datetime.utcnow()
@@ -56,6 +104,26 @@ class IncidentAgent:
             self.status = "error"
             raise
 
+    def _memory_text(self, incident_data: Dict[str, Any]) -> str:
+        """Similarity text: the incident summary plus this role's normalized input"""
+        parts = [incident_data.get(field) for field in ("title", "description", "severity")]
+        summary = " ".join(str(part) for part in parts if part)
+        if not summary:
+            return ""
+        field = ROLE_INPUTS.get(self.role.name)
+        if field is not None:
+            role_input = incident_data.get(field)
+        else:
+            role_input = {name: value for name, value in incident_data.items() if name not in ROLE_INPUTS.values()}
+        return "\n".join([summary] + content_lines(role_input))
+
+    def _memory_key(self, incident_data: Dict[str, Any]) -> Optional[str]:
+        """Exact-match part of a memory lookup; None disables reuse for the role"""
+        if self.role.name == "DashboardAnalyzer":
+            # Correlations are relative to this incident's own start time
+            return None
+        return ",".join(sorted(str(service) for service in incident_data.get("affected_services") or []))
+
     async def _analyze_logs(self, logs: List[Dict[str, Any]]) -> Dict[str, Any]:
         # Implement log analysis logic
         return {
@@ -73,13 +141,38 @@ class IncidentAgent:
         }
 
     async def _analyze_dashboard(self, dashboard_data: Dict[str, Any]) -> Dict[str, Any]:
-        # Implement dashboard analysis logic
+        # Correlate dashboard series with each incident's start
         return {
             "visualization_insights": [],
-            "correlations": {},
+            "correlations": self._correlate_dashboard(dashboard_data),
             "recommendations": []
         }
 
+    def _correlate_dashboard(self, dashboard_data: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+        series = {}
+        for name, raw in (dashboard_data.get("series") or {}).items():
+            try:
+                series[name] = parse_series(raw)
+            except Exception as e:
+                logger.warning(f"Skipping unparseable dashboard series {name}: {str(e)}")
+
+        incidents = dashboard_data.get("incidents") or [{
+            "id": dashboard_data.get("incident_id"),
+            "start": dashboard_data.get("incident_start"),
+            "reference": dashboard_data.get("reference")
+        }]
+
+        correlations = {}
+        for incident in incidents:
+            if not series or incident.get("start") is None:
+                continue
+            correlations[str(incident.get("id"))] = self.correlation_engine.correlate_incident(
+                series,
+                incident["start"],
+                reference=incident.get("reference")
+            )
+        return correlations
+
     async def _general_analysis(self, data: Dict[str, Any]) -> Dict[str, Any]:
         # Implement general analysis logic
         return {
@@ -89,8 +182,9 @@ class IncidentAgent:
         }
 
 class AgentManager:
-    def __init__(self):
+    def __init__(self, deduplicator: Optional[AlertDeduplicator] = None):
         self.agents: Dict[str, IncidentAgent] = {}
+        self.deduplicator = deduplicator or AlertDeduplicator()
         self._initialize_agents()
 
     def _initialize_agents(self):
@@ -119,14 +213,38 @@ class AgentManager:
         self.agents["dashboard_agent"] = IncidentAgent("dashboard_agent_1", dashboard_analyzer)
 
     async def analyze_incident(self, incident_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        # Only one incident per group is analyzed; the others reuse its results.
+        # Incidents created through the API were ingested there already.
+        group = self.deduplicator.group_of(incident_data.get("id"))
+        if group is None:
+            group, _ = self.deduplicator.ingest(incident_data)
+        if group.analysis_ready is not None:
+            logger.info(f"Incident {incident_data.get('id')} grouped into {group.group_id}, skipping analysis")
+            if group.analysis is None:
+                # The group is still being analyzed
+                await asyncio.shield(group.analysis_ready)
+            representative_id = group.representative.get("id")
+            if representative_id == incident_data.get("id"):
+                return [dict(result) for result in group.analysis]
+            return [
+                {**result, "duplicate_of": representative_id}
+                for result in group.analysis
+            ]
+
+        group.analysis_ready = asyncio.get_running_loop().create_future()
         results = []
-        for agent in self.agents.values():
-            try:
-                analysis = await agent.analyze_incident(incident_data)
-                results.append(analysis)
-            except Exception as e:
-                logger.error(f"Error in agent {agent.agent_id}: {str(e)}")
-                continue
+        try:
+            for agent in self.agents.values():
+                try:
+                    analysis = await agent.analyze_incident(incident_data)
+                    results.append({**analysis, "group_id": group.group_id})
+                except Exception as e:
+                    logger.error(f"Error in agent {agent.agent_id}: {str(e)}")
+                    continue
+        finally:
+            # Release waiting duplicates even if this analysis was cancelled
+            group.analysis = results
+            group.analysis_ready.set_result(None)
         return results
 
     def get_agent_status(self, agent_id: str) -> Dict[str, Any]:
@@ -136,6 +254,7 @@ class AgentManager:
                 "agent_id": agent.agent_id,
                 "role": agent.role.name,
                 "status": agent.status,
-                "last_active": agent.last_active.isoformat()
+                "last_active": agent.last_active.isoformat(),
+                "memory": agent.memory.stats()
             }
         return {"error": "Agent not found"} 
\ No newline at end of file
@@ -0,0 +1,138 @@
+from typing import List, Dict, Any, Optional, Callable
+from collections import Counter
+from datetime import datetime
+import logging
+import os
+import zlib
+import numpy as np
+from .deduplication import normalize_text
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_CAPACITY = int(os.getenv("AGENT_MEMORY_CAPACITY", "256"))
+DEFAULT_REUSE_THRESHOLD = float(os.getenv("AGENT_MEMORY_REUSE_THRESHOLD", "0.9"))
+EMBEDDING_DIM = 256
+MAX_SUMMARY_KEYS = 50
+
+def hashed_embedding(text: str, dim: int = EMBEDDING_DIM) -> np.ndarray:
+    """Unit-length signed feature-hashing vector of the normalized text"""
+    vector = np.zeros(dim, dtype=np.float32)
+    for token in normalize_text(text).split():
+        h = zlib.crc32(token.encode("utf-8"))
+        vector[h % dim] += 1.0 if h & 0x80000000 else -1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+class MemoryRecord:
+    __slots__ = ("incident_id", "text", "key", "analysis", "created_at", "hits")
+
+    def __init__(self, incident_id: Optional[str], text: str, analysis: Dict[str, Any], key: Optional[str] = None):
+        self.incident_id = incident_id
+        self.text = text
+        self.key = key
+        self.analysis = analysis
+        self.created_at = datetime.utcnow()
+        self.hits = 0
+
+class AgentMemory:
+    """Fixed-capacity ring buffer of past analyses with similarity lookup.
+
+    Embeddings are computed once per record and cached in a preallocated
+    matrix, so a lookup is a single matrix-vector product. Records may carry
+    an exact-match ``key`` (e.g. a digest of the inputs the analysis depends
+    on); keyed lookups only consider records with the same key. When the
+    buffer is full the oldest record is evicted and folded into a running
+    summary.
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_MEMORY_CAPACITY,
+        reuse_threshold: float = DEFAULT_REUSE_THRESHOLD,
+        embed: Optional[Callable[[str], Any]] = None,
+        dim: int = EMBEDDING_DIM
+    ):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.reuse_threshold = reuse_threshold
+        self.embed = embed or (lambda text: hashed_embedding(text, dim))
+        self._records: List[Optional[MemoryRecord]] = [None] * capacity
+        self._embeddings = np.zeros((capacity, dim), dtype=np.float32)
+        self._key_hashes = np.zeros(capacity, dtype=np.int64)
+        self._next = 0
+        self._size = 0
+        self.evicted = 0
+        self.summary: Counter = Counter()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(
+        self,
+        text: str,
+        analysis: Dict[str, Any],
+        incident_id: Optional[str] = None,
+        key: Optional[str] = None
+    ) -> MemoryRecord:
+        slot = self._next
+        old = self._records[slot]
+        if old is not None:
+            self._summarize(old)
+
+        record = MemoryRecord(incident_id, text, analysis, key)
+        self._records[slot] = record
+        self._embeddings[slot] = self._normalized(self.embed(text))
+        self._key_hashes[slot] = self._key_hash(key)
+        self._next = (slot + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        return record
+
+    def find_similar(self, text: str, top_k: int = 1, key: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return the most similar past analyses with their cosine scores"""
+        if not self._size:
+            return []
+        scores = self._embeddings[:self._size] @ self._normalized(self.embed(text))
+        if key is not None:
+            scores = np.where(self._key_hashes[:self._size] == self._key_hash(key), scores, -np.inf)
+        k = min(top_k, self._size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            {"record": self._records[i], "similarity": float(scores[i])}
+            for i in top
+            # Hashes can collide, so keys are confirmed on the record
+            if key is None or self._records[i].key == key
+        ]
+
+    def recall(self, text: str, key: Optional[str] = None) -> Optional[MemoryRecord]:
+        """Return a past analysis close enough to reuse, if any"""
+        matches = self.find_similar(text, key=key)
+        if not matches or matches[0]["similarity"] < self.reuse_threshold:
+            return None
+        record = matches[0]["record"]
+        record.hits += 1
+        return record
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self._size,
+            "capacity": self.capacity,
+            "evicted": self.evicted,
+            "recurring": dict(self.summary.most_common(10))
+        }
+
+    def _summarize(self, record: MemoryRecord):
+        # Keep only a bounded count of evicted incident patterns
+        self.evicted += 1
+        self.summary[normalize_text(record.text)[:120]] += 1 + record.hits
+        if len(self.summary) > MAX_SUMMARY_KEYS:
+            self.summary = Counter(dict(self.summary.most_common(MAX_SUMMARY_KEYS // 2)))
+
+    def _key_hash(self, key: Optional[str]) -> int:
+        return zlib.crc32(key.encode("utf-8")) if key is not None else -1
+
+    def _normalized(self, embedding: Any) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
@@ -1,12 +1,54 @@
 from fastapi import APIRouter, HTTPException
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from ..services.vector_search import VectorSearchService
 from ..services.bert_embeddings import BERTVectorSearch, BERTModelType
+from ..services.index_rebuilder import IndexRebuilder
 from pydantic import BaseModel, Field
+import threading
 
 router = APIRouter()
-vector_search = VectorSearchService()
-bert_search = BERTVectorSearch()
+
+# Search services load embedding models, so they are created on first use
+# (or by warmup()) rather than at import time. BERT searchers are kept per
+# model so rebuilt indices are the ones that get queried. Handlers that may
+# construct a service or run a model are plain ``def`` so FastAPI runs them in
+# its threadpool instead of blocking the event loop (and liveness probes).
+_vector_search: Optional[VectorSearchService] = None
+bert_searches: Dict[BERTModelType, BERTVectorSearch] = {}
+rebuilders: Dict[str, IndexRebuilder] = {}
+_services_lock = threading.Lock()
+
+def get_vector_search() -> VectorSearchService:
+    global _vector_search
+    if _vector_search is None:
+        with _services_lock:
+            if _vector_search is None:
+                _vector_search = VectorSearchService()
+    return _vector_search
+
+def get_bert_search(model_type: BERTModelType = BERTModelType.BERT_BASE) -> BERTVectorSearch:
+    if model_type not in bert_searches:
+        with _services_lock:
+            if model_type not in bert_searches:
+                bert_searches[model_type] = BERTVectorSearch(model_type=model_type)
+    return bert_searches[model_type]
+
+def get_rebuilder(model_type: Optional[BERTModelType] = None) -> IndexRebuilder:
+    name = "traditional" if model_type is None else f"bert-{model_type.name.lower()}"
+    if name not in rebuilders:
+        if model_type is None:
+            vector_search = get_vector_search()
+            rebuilder = IndexRebuilder(name, vector_search, prepare_texts=vector_search._prepare_texts)
+        else:
+            rebuilder = IndexRebuilder(name, get_bert_search(model_type))
+        rebuilders.setdefault(name, rebuilder)
+    return rebuilders[name]
+
+def warmup(model_types: Tuple[BERTModelType, ...] = (BERTModelType.BERT_BASE,)):
+    """Load the embedding models ahead of the first request"""
+    get_vector_search()
+    for model_type in model_types:
+        get_bert_search(model_type)
 
 class SearchQuery(BaseModel):
     query: str
@@ -32,20 +74,18 @@ class SimilarityQuery(BaseModel):
     model_type: Optional[BERTModelType] = BERTModelType.BERT_BASE
 
 @router.post("/search", response_model=List[Dict[str, Any]])
-async def search_similar_incidents(search_query: SearchQuery):
+def search_similar_incidents(search_query: SearchQuery):
     """Search for similar incidents using vector similarity"""
     try:
         if search_query.use_bert:
-            # Initialize BERT search with specified model
-            bert_search = BERTVectorSearch(model_type=search_query.model_type)
-            similar_incidents = bert_search.search_similar_incidents(
+            similar_incidents = get_bert_search(search_query.model_type).search_similar_incidents(
                 query=search_query.query,
                 k=search_query.k,
                 use_hybrid=search_query.use_hybrid,
                 hybrid_weight=search_query.hybrid_weight
             )
         else:
-            similar_incidents = vector_search.search_similar_incidents(
+            similar_incidents = get_vector_search().search_similar_incidents(
                 query=search_query.query,
                 k=search_query.k
             )
@@ -54,12 +94,10 @@ async def search_similar_incidents(search_query: SearchQuery):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/similarity", response_model=float)
-async def calculate_similarity(similarity_query: SimilarityQuery):
+def calculate_similarity(similarity_query: SimilarityQuery):
     """Calculate similarity between two texts using BERT embeddings"""
     try:
-        # Initialize BERT search with specified model
-        bert_search = BERTVectorSearch(model_type=similarity_query.model_type)
-        similarity = bert_search.get_embedding_similarity(
+        similarity = get_bert_search(similarity_query.model_type).get_embedding_similarity(
             similarity_query.text1,
             similarity_query.text2
         )
@@ -68,34 +106,53 @@ async def calculate_similarity(similarity_query: SimilarityQuery):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/incidents", response_model=Dict[str, Any])
-async def add_incident(incident: Incident):
+def add_incident(incident: Incident):
     """Add a new incident to the vector store"""
     try:
         # Add to both vector stores
-        vector_search.add_incident(incident.dict())
-        bert_search.add_incident(incident.dict())
+        get_vector_search().add_incident(incident.dict())
+        get_bert_search().add_incident(incident.dict())
         return {"message": "Incident added successfully", "incident_id": incident.IncidentId}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.put("/incidents/{incident_id}", response_model=Dict[str, Any])
-async def update_incident(incident_id: str, updates: Dict[str, Any]):
+def update_incident(incident_id: str, updates: Dict[str, Any]):
     """Update an incident in the vector store"""
     try:
         # Update in both vector stores
-        vector_search.update_incident(incident_id, updates)
-        bert_search.update_incident(incident_id, updates)
+        get_vector_search().update_incident(incident_id, updates)
+        get_bert_search().update_incident(incident_id, updates)
         return {"message": "Incident updated successfully", "incident_id": incident_id}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/rebuild-index", response_model=Dict[str, Any])
-async def rebuild_index(model_type: Optional[BERTModelType] = BERTModelType.BERT_BASE):
-    """Rebuild the vector index"""
+def rebuild_index(model_type: Optional[BERTModelType] = BERTModelType.BERT_BASE):
+    """Start a background rebuild of the vector indices"""
     try:
-        vector_search.build_index()
-        bert_search = BERTVectorSearch(model_type=model_type)
-        bert_search.build_index()
-        return {"message": "Vector indices rebuilt successfully"}
+        jobs = [get_rebuilder().start(), get_rebuilder(model_type).start()]
+        return {
+            "message": "Vector index rebuild started",
+            "jobs": [job.to_dict() for job in jobs]
+        }
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/rebuild-index/status", response_model=List[Dict[str, Any]])
+async def rebuild_index_status():
+    """Get the latest rebuild job for each vector index"""
+    return [
+        rebuilder.current_job.to_dict()
+        for rebuilder in rebuilders.values()
+        if rebuilder.current_job is not None
+    ]
+
+@router.get("/rebuild-index/{job_id}", response_model=Dict[str, Any])
+async def get_rebuild_job(job_id: str):
+    """Get progress of a vector index rebuild job"""
+    for rebuilder in rebuilders.values():
+        job = rebuilder.get_job(job_id)
+        if job is not None:
+            return job.to_dict()
+    raise HTTPException(status_code=404, detail=f"Rebuild job {job_id} not found")
@@ -0,0 +1,7 @@
+import os
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Application-owned state lives next to the code (/app/data in the container)
+# rather than in a world-writable directory such as /tmp
+DATA_DIR = os.getenv("AIOPS_DATA_DIR", os.path.join(BACKEND_DIR, "data"))
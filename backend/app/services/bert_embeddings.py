@@ -1,81 +1,51 @@
 from typing import List, Dict, Any, Optional, Tuple
-from transformers import AutoTokenizer, AutoModel
-import torch
 import numpy as np
-from langchain.embeddings.base import Embeddings
 from enum import Enum
 import time
 import datetime
-import boto3
 import logging
+from .metrics import stage_latency, stage_counter
 
 logger = logging.getLogger(__name__)
 
+TOKENIZATION_LATENCY = stage_latency("tokenization")
+MODEL_FORWARD_LATENCY = stage_latency("model_forward")
+FAISS_SEARCH_LATENCY = stage_latency("faiss_search", index="bert")
+DYNAMODB_HYDRATION_LATENCY = stage_latency("dynamodb_hydration", index="bert")
+EMBEDDED_TEXTS = stage_counter("embedded_texts_total", "Texts embedded by BERT models")
+
 class BERTModelType(Enum):
     BERT_BASE = "bert-base-uncased"
     BERT_LARGE = "bert-large-uncased"
     ROBERTA = "roberta-base"
     DISTILBERT = "distilbert-base-uncased"
 
-class BERTEmbeddings(Embeddings):
-    def __init__(self, model_type: BERTModelType = BERTModelType.BERT_BASE):
-        """Initialize BERT embeddings with specified model"""
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        self.model_type = model_type
-        self.tokenizer = AutoTokenizer.from_pretrained(model_type.value)
-        self.model = AutoModel.from_pretrained(model_type.value).to(self.device)
-        self.model.eval()
-        
-    def _get_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for a list of texts using BERT"""
-        embeddings = []
-        
-        with torch.no_grad():
-            for text in texts:
-                # Tokenize and prepare input
-                inputs = self.tokenizer(
-                    text,
-                    padding=True,
-                    truncation=True,
-                    max_length=512,
-                    return_tensors="pt"
-                ).to(self.device)
-                
-                # Get BERT outputs
-                outputs = self.model(**inputs)
-                
-                # Use CLS token embedding (first token)
-                cls_embedding = outputs.last_hidden_state[0][0].cpu().numpy()
-                
-                # Normalize embedding
-                normalized_embedding = cls_embedding / np.linalg.norm(cls_embedding)
-                embeddings.append(normalized_embedding.tolist())
-        
-        return embeddings
-    
-    def embed_documents(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for documents"""
-        return self._get_embeddings(texts)
-    
-    def embed_query(self, text: str) -> List[float]:
-        """Generate embedding for a single query"""
-        return self._get_embeddings([text])[0]
-
 class BERTVectorSearch:
     def __init__(self, model_type: BERTModelType = BERTModelType.BERT_BASE):
         """Initialize BERT-based vector search"""
+        import boto3
+        # langchain and torch take seconds to import, so the embeddings class
+        # lives in its own module that is only loaded when a model is
+        from .bert_model import BERTEmbeddings
+
         self.embeddings = BERTEmbeddings(model_type)
         self.vector_store = None
         self.dynamodb = boto3.resource('dynamodb')
         self.table = self.dynamodb.Table('AIOpsGuardian-Incidents')
         self.cloudwatch = boto3.client('cloudwatch')
         
+    def _load_incidents(self) -> List[Dict[str, Any]]:
+        """Load incidents from DynamoDB"""
+        response = self.table.scan()
+        return response.get('Items', [])
+    
     def _prepare_documents(self, incidents: List[Dict[str, Any]]) -> List[str]:
         """Prepare incident documents for BERT embedding"""
         documents = []
         for incident in incidents:
             # Create a rich text representation optimized for BERT
             doc = f"""
+            Incident ID: {incident.get('IncidentId', '')}
             Incident: {incident.get('Title', '')}
             Description: {incident.get('Description', '')}
             Root Cause: {incident.get('RootCause', '')}
@@ -94,6 +64,8 @@ class BERTVectorSearch:
         documents = self._prepare_documents(incidents)
         
         # Create or update vector store with BERT embeddings
+        from langchain.vectorstores import FAISS
+
         if self.vector_store is None:
             self.vector_store = FAISS.from_documents(
                 documents=documents,
@@ -124,7 +96,8 @@ class BERTVectorSearch:
         start_time = time.time()
         
         # Perform BERT-based search
-        bert_docs = self.vector_store.similarity_search(query, k=k)
+        with FAISS_SEARCH_LATENCY.time():
+            bert_docs = self.vector_store.similarity_search(query, k=k)
         bert_scores = [doc.metadata.get('score', 0) for doc in bert_docs]
         
         if use_hybrid:
@@ -153,10 +126,11 @@ class BERTVectorSearch:
             incident_ids.append(incident_id)
         
         similar_incidents = []
-        for incident_id in incident_ids:
-            response = self.table.get_item(Key={'IncidentId': incident_id})
-            if 'Item' in response:
-                similar_incidents.append(response['Item'])
+        with DYNAMODB_HYDRATION_LATENCY.time():
+            for incident_id in incident_ids:
+                response = self.table.get_item(Key={'IncidentId': incident_id})
+                if 'Item' in response:
+                    similar_incidents.append(response['Item'])
         
         # Log performance metrics
         duration = time.time() - start_time
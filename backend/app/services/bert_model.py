@@ -0,0 +1,61 @@
+from typing import List
+import numpy as np
+from langchain.embeddings.base import Embeddings
+from .bert_embeddings import (
+    BERTModelType,
+    TOKENIZATION_LATENCY,
+    MODEL_FORWARD_LATENCY,
+    EMBEDDED_TEXTS,
+)
+
+class BERTEmbeddings(Embeddings):
+    def __init__(self, model_type: BERTModelType = BERTModelType.BERT_BASE):
+        """Initialize BERT embeddings with specified model"""
+        import torch
+        from transformers import AutoTokenizer, AutoModel
+
+        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self.model_type = model_type
+        self.tokenizer = AutoTokenizer.from_pretrained(model_type.value)
+        self.model = AutoModel.from_pretrained(model_type.value).to(self.device)
+        self.model.eval()
+        
+    def _get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for a list of texts using BERT"""
+        import torch
+
+        embeddings = []
+        
+        with torch.no_grad():
+            for text in texts:
+                # Tokenize and prepare input
+                with TOKENIZATION_LATENCY.time():
+                    inputs = self.tokenizer(
+                        text,
+                        padding=True,
+                        truncation=True,
+                        max_length=512,
+                        return_tensors="pt"
+                    ).to(self.device)
+                
+                # Get BERT outputs
+                with MODEL_FORWARD_LATENCY.time():
+                    outputs = self.model(**inputs)
+                
+                # Use CLS token embedding (first token)
+                cls_embedding = outputs.last_hidden_state[0][0].cpu().numpy()
+                
+                # Normalize embedding
+                normalized_embedding = cls_embedding / np.linalg.norm(cls_embedding)
+                embeddings.append(normalized_embedding.tolist())
+        
+        EMBEDDED_TEXTS.inc(len(texts))
+        return embeddings
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for documents"""
+        return self._get_embeddings(texts)
+    
+    def embed_query(self, text: str) -> List[float]:
+        """Generate embedding for a single query"""
+        return self._get_embeddings([text])[0]
@@ -0,0 +1,225 @@
+from typing import List, Dict, Any, Optional, Callable
+from enum import Enum
+from datetime import datetime
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from ..config import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+# Checkpoints are reloaded with FAISS.load_local, which unpickles the
+# docstore, so they must not live in a world-writable directory like /tmp
+DEFAULT_CHECKPOINT_DIR = os.getenv("INDEX_CHECKPOINT_DIR", os.path.join(DATA_DIR, "index-checkpoints"))
+DEFAULT_CHECKPOINT_INTERVAL = float(os.getenv("INDEX_CHECKPOINT_INTERVAL_SECONDS", "60"))
+
+class RebuildStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class RebuildJob:
+    def __init__(self, index_name: str):
+        self.job_id = str(uuid.uuid4())
+        self.index_name = index_name
+        self.status = RebuildStatus.PENDING
+        self.total = 0
+        self.processed = 0
+        self.resumed_from = 0
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in (RebuildStatus.PENDING, RebuildStatus.RUNNING)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "index_name": self.index_name,
+            "status": self.status.value,
+            "total": self.total,
+            "processed": self.processed,
+            "progress": round(self.processed / self.total, 4) if self.total else 0.0,
+            "resumed_from": self.resumed_from,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None
+        }
+
+class IndexRebuilder:
+    """Rebuild a search service's FAISS index in the background.
+
+    The new index is built into a shadow store while queries keep using the
+    service's current ``vector_store``; the reference is swapped once the
+    build completes. Documents the service adds while the build runs are
+    captured and replayed onto the shadow store before the swap, so they are
+    not lost. Progress is checkpointed every ``checkpoint_interval`` seconds
+    so an interrupted rebuild of the same corpus resumes where it stopped.
+    """
+
+    def __init__(
+        self,
+        index_name: str,
+        search_service: Any,
+        prepare_texts: Optional[Callable[[List[Dict[str, Any]]], List[str]]] = None,
+        batch_size: int = 64,
+        checkpoint_dir: str = DEFAULT_CHECKPOINT_DIR,
+        checkpoint_interval: float = DEFAULT_CHECKPOINT_INTERVAL
+    ):
+        self.index_name = index_name
+        self.search_service = search_service
+        self.prepare_texts = prepare_texts or search_service._prepare_documents
+        self.batch_size = batch_size
+        self.checkpoint_path = os.path.join(checkpoint_dir, index_name)
+        self.checkpoint_interval = checkpoint_interval
+        self.jobs: Dict[str, RebuildJob] = {}
+        self.current_job: Optional[RebuildJob] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> RebuildJob:
+        """Start a rebuild, or return the one already in progress"""
+        with self._lock:
+            if self.current_job is not None and self.current_job.is_active:
+                return self.current_job
+            job = RebuildJob(self.index_name)
+            self.jobs[job.job_id] = job
+            self.current_job = job
+
+        thread = threading.Thread(
+            target=self._run,
+            args=(job,),
+            name=f"index-rebuild-{self.index_name}",
+            daemon=True
+        )
+        thread.start()
+        return job
+
+    def get_job(self, job_id: str) -> Optional[RebuildJob]:
+        return self.jobs.get(job_id)
+
+    def _run(self, job: RebuildJob):
+        job.status = RebuildStatus.RUNNING
+        job.started_at = datetime.utcnow()
+        # Services without a write lock (read-only indices) have nothing to replay
+        write_lock = getattr(self.search_service, "write_lock", None)
+        if write_lock is not None:
+            with write_lock:
+                self.search_service.captured_writes = []
+        try:
+            from langchain.vectorstores import FAISS
+
+            incidents = self.search_service._load_incidents()
+            texts = self.prepare_texts(incidents)
+            job.total = len(texts)
+            fingerprint = self._fingerprint(texts)
+
+            shadow_store, start = self._load_checkpoint(fingerprint)
+            job.processed = job.resumed_from = start
+
+            embeddings = self.search_service.embeddings
+            last_checkpoint = time.monotonic()
+            for offset in range(start, len(texts), self.batch_size):
+                batch = texts[offset:offset + self.batch_size]
+                if shadow_store is None:
+                    shadow_store = FAISS.from_texts(batch, embeddings)
+                else:
+                    shadow_store.add_texts(batch)
+                job.processed = offset + len(batch)
+                # Each checkpoint rewrites the whole shadow index, so bound them by time
+                if time.monotonic() - last_checkpoint >= self.checkpoint_interval:
+                    self._save_checkpoint(shadow_store, fingerprint, job.total, job.processed)
+                    last_checkpoint = time.monotonic()
+
+            if write_lock is None:
+                self.search_service.vector_store = shadow_store
+            else:
+                with write_lock:
+                    # Writes made after the scan above are only in the live store.
+                    # Anything the scan already saw is skipped.
+                    indexed = set(texts)
+                    replay = [
+                        doc for doc in self.search_service.captured_writes
+                        if doc.page_content not in indexed
+                    ]
+                    if replay and shadow_store is None:
+                        shadow_store = FAISS.from_documents(replay, embeddings)
+                    elif replay:
+                        shadow_store.add_documents(replay)
+                    # Swap the fully built index in with a single reference assignment
+                    self.search_service.vector_store = shadow_store
+                if replay:
+                    logger.info(f"Replayed {len(replay)} documents added during the {self.index_name} rebuild")
+            self._clear_checkpoint()
+
+            job.status = RebuildStatus.COMPLETED
+            logger.info(f"Rebuilt {self.index_name} index with {job.total} documents")
+        except Exception as e:
+            logger.error(f"Error rebuilding {self.index_name} index: {str(e)}")
+            job.status = RebuildStatus.FAILED
+            job.error = str(e)
+        finally:
+            if write_lock is not None:
+                with write_lock:
+                    self.search_service.captured_writes = None
+            job.finished_at = datetime.utcnow()
+
+    def _fingerprint(self, texts: List[str]) -> str:
+        digest = hashlib.sha256()
+        for text in texts:
+            digest.update(text.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _load_checkpoint(self, fingerprint: str):
+        """Return the partial shadow store and resume offset for this corpus"""
+        progress_file = os.path.join(self.checkpoint_path, "progress.json")
+        try:
+            if not os.path.exists(progress_file):
+                return None, 0
+            with open(progress_file) as f:
+                progress = json.load(f)
+            if progress.get("fingerprint") != fingerprint:
+                # The corpus changed since the checkpoint was written
+                self._clear_checkpoint()
+                return None, 0
+            from langchain.vectorstores import FAISS
+
+            store = FAISS.load_local(
+                os.path.join(self.checkpoint_path, "index"),
+                self.search_service.embeddings
+            )
+            logger.info(f"Resuming {self.index_name} rebuild at {progress['processed']}/{progress['total']}")
+            return store, int(progress["processed"])
+        except Exception as e:
+            logger.error(f"Error loading {self.index_name} rebuild checkpoint: {str(e)}")
+            return None, 0
+
+    def _save_checkpoint(self, store: Any, fingerprint: str, total: int, processed: int):
+        try:
+            os.makedirs(self.checkpoint_path, mode=0o700, exist_ok=True)
+            store.save_local(os.path.join(self.checkpoint_path, "index"))
+            progress_file = os.path.join(self.checkpoint_path, "progress.json")
+            tmp_file = progress_file + ".tmp"
+            with open(tmp_file, "w") as f:
+                json.dump({
+                    "fingerprint": fingerprint,
+                    "processed": processed,
+                    "total": total,
+                    "updated_at": datetime.utcnow().isoformat()
+                }, f)
+            os.replace(tmp_file, progress_file)
+        except Exception as e:
+            logger.error(f"Error saving {self.index_name} rebuild checkpoint: {str(e)}")
+
+    def _clear_checkpoint(self):
+        shutil.rmtree(self.checkpoint_path, ignore_errors=True)
@@ -0,0 +1,195 @@
+from typing import List, Dict, Tuple, Optional
+from bisect import bisect_left
+import threading
+import time
+import weakref
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in pairs) + "}"
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class _ShardOwner:
+    """Lives in a thread's local storage; collected when the thread exits"""
+
+    __slots__ = ("__weakref__",)
+
+class _Sharded:
+    """Per-thread storage so recording never takes a lock.
+
+    Each thread writes only to its own shard; readers sum across shards. When
+    a thread exits its shard is folded into a retired total, so short-lived
+    worker threads don't accumulate shards.
+    """
+
+    __slots__ = ("name", "labels", "_local", "_shards", "_size", "_retired", "_retire_lock")
+
+    def __init__(self, name: str, labels: Tuple[Tuple[str, str], ...], size: int):
+        self.name = name
+        self.labels = labels
+        self._local = threading.local()
+        self._shards: List[List[float]] = []
+        self._size = size
+        self._retired = [0.0] * size
+        self._retire_lock = threading.Lock()
+
+    def _shard(self) -> List[float]:
+        shard = [0.0] * self._size
+        owner = _ShardOwner()
+        self._local.shard = shard
+        self._local.owner = owner
+        weakref.finalize(owner, self._retire, shard)
+        # list.append is atomic, so registering a new thread needs no lock
+        self._shards.append(shard)
+        return shard
+
+    def _retire(self, shard: List[float]):
+        # Runs once the owning thread has exited, so the shard no longer changes
+        with self._retire_lock:
+            for i, value in enumerate(shard):
+                self._retired[i] += value
+            self._shards.remove(shard)
+
+    def _totals(self) -> List[float]:
+        with self._retire_lock:
+            totals = list(self._retired)
+            shards = list(self._shards)
+        for shard in shards:
+            for i, value in enumerate(shard):
+                totals[i] += value
+        return totals
+
+class Counter(_Sharded):
+    __slots__ = ()
+
+    def __init__(self, name: str, labels: Tuple[Tuple[str, str], ...]):
+        super().__init__(name, labels, 1)
+
+    def inc(self, amount: float = 1.0):
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._shard()
+        shard[0] += amount
+
+    def value(self) -> float:
+        return self._totals()[0]
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labels)} {_format_value(self.value())}"]
+
+class _Timer:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram: "Histogram"):
+        self.histogram = histogram
+
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start)
+
+class Histogram(_Sharded):
+    """Fixed-bucket histogram; shard layout is [bucket counts..., +Inf count, sum]"""
+
+    __slots__ = ("buckets",)
+
+    def __init__(self, name: str, labels: Tuple[Tuple[str, str], ...], buckets: Tuple[float, ...]):
+        super().__init__(name, labels, len(buckets) + 2)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float):
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._shard()
+        shard[bisect_left(self.buckets, value)] += 1
+        shard[-1] += value
+
+    def time(self) -> _Timer:
+        """Context manager that observes the elapsed wall time in seconds"""
+        return _Timer(self)
+
+    def render(self) -> List[str]:
+        totals = self._totals()
+        lines = []
+        cumulative = 0.0
+        for bound, count in zip(self.buckets + (float("inf"),), totals[:-1]):
+            cumulative += count
+            labels = _format_labels(self.labels, ("le", _format_value(bound)))
+            lines.append(f"{self.name}_bucket{labels} {_format_value(cumulative)}")
+        labels = _format_labels(self.labels)
+        lines.append(f"{self.name}_sum{labels} {_format_value(totals[-1])}")
+        lines.append(f"{self.name}_count{labels} {_format_value(cumulative)}")
+        return lines
+
+class MetricsRegistry:
+    """In-process metrics rendered in the Prometheus text exposition format.
+
+    Metrics are created once and cached by name and labels; keep the returned
+    object around on hot paths instead of looking it up per sample.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], _Sharded] = {}
+        self._families: Dict[str, Tuple[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, **labels: str) -> Counter:
+        return self._get(name, documentation, "counter", labels, lambda key: Counter(name, key))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+        **labels: str
+    ) -> Histogram:
+        return self._get(name, documentation, "histogram", labels, lambda key: Histogram(name, key, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for name, (kind, documentation) in sorted(self._families.items()):
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            for (metric_name, _), metric in list(self._metrics.items()):
+                if metric_name == name:
+                    lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def _get(self, name, documentation, kind, labels, factory):
+        key = tuple(sorted(labels.items()))
+        metric = self._metrics.get((name, key))
+        if metric is not None:
+            return metric
+        with self._lock:
+            family = self._families.setdefault(name, (kind, documentation))
+            if family[0] != kind:
+                raise ValueError(f"Metric {name} already registered as a {family[0]}")
+            return self._metrics.setdefault((name, key), factory(key))
+
+REGISTRY = MetricsRegistry()
+
+def stage_latency(stage: str, **labels: str) -> Histogram:
+    """Latency histogram for one hot-path stage"""
+    return REGISTRY.histogram(
+        "aiops_stage_latency_seconds", "Latency of backend hot-path stages in seconds", stage=stage, **labels
+    )
+
+def stage_counter(name: str, documentation: str, **labels: str) -> Counter:
+    return REGISTRY.counter(f"aiops_{name}", documentation, **labels)
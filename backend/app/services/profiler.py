@@ -0,0 +1,79 @@
+from typing import Dict, Any, Optional
+from collections import Counter
+import logging
+import os
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class SamplingProfiler:
+    """Low-overhead wall-clock sampling profiler.
+
+    A daemon thread snapshots every thread's stack at ``interval`` seconds and
+    aggregates them as collapsed stacks (``frame;frame;frame count``), the
+    input format of flamegraph tools. Nothing runs on the sampled threads.
+    """
+
+    def __init__(self, interval: float = 0.01, max_depth: int = 64, max_stacks: int = 10000):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.max_stacks = max_stacks
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.started_at: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self.stacks.clear()
+        self.samples = 0
+        self.started_at = time.time()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        logger.info(f"Sampling profiler started at {self.interval * 1000:.1f}ms intervals")
+
+    def stop(self):
+        if not self.running:
+            return
+        self._stop.set()
+        self._thread.join()
+        logger.info(f"Sampling profiler stopped after {self.samples} samples")
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "interval_seconds": self.interval,
+            "samples": self.samples,
+            "unique_stacks": len(self.stacks),
+            "started_at": self.started_at
+        }
+
+    def collapsed(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                frames = []
+                while frame is not None and len(frames) < self.max_depth:
+                    code = frame.f_code
+                    frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                stack = ";".join(reversed(frames))
+                if stack in self.stacks or len(self.stacks) < self.max_stacks:
+                    self.stacks[stack] += 1
+            self.samples += 1
+
+PROFILER = SamplingProfiler(interval=float(os.getenv("PROFILER_INTERVAL_SECONDS", "0.01")))
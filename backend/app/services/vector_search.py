@@ -1,16 +1,25 @@
-from typing import List, Dict, Any
-from langchain.embeddings import HuggingFaceEmbeddings
-from langchain.vectorstores import FAISS
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain.document_loaders import JSONLoader
+from typing import List, Dict, Any, Optional
 import json
-import boto3
+import threading
 from datetime import datetime
+from .metrics import stage_latency
+
+FAISS_SEARCH_LATENCY = stage_latency("faiss_search", index="traditional")
+DYNAMODB_HYDRATION_LATENCY = stage_latency("dynamodb_hydration", index="traditional")
 
 class VectorSearchService:
     def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
+        # langchain, model and AWS SDK imports are deferred until they are used
+        import boto3
+        from langchain.embeddings import HuggingFaceEmbeddings
+
         self.embeddings = HuggingFaceEmbeddings(model_name=model_name)
         self.vector_store = None
+        # Guards vector_store writes; while an IndexRebuilder is running, added
+        # documents are also captured here so they can be replayed onto its
+        # shadow index before the swap
+        self.write_lock = threading.Lock()
+        self.captured_writes: Optional[List[Any]] = None
         self.dynamodb = boto3.resource('dynamodb')
         self.table = self.dynamodb.Table('AIOpsGuardian-Incidents')
         
@@ -38,12 +47,27 @@ class VectorSearchService:
             documents.append(doc)
         return documents
     
+    def _prepare_texts(self, incidents: List[Dict[str, Any]]) -> List[str]:
+        """Prepare chunked incident texts for embedding"""
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+        text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=1000,
+            chunk_overlap=200
+        )
+        texts = []
+        for document in self._prepare_documents(incidents):
+            texts.extend(text_splitter.split_text(document))
+        return texts
+    
     def build_index(self):
         """Build or update the vector index"""
         incidents = self._load_incidents()
         documents = self._prepare_documents(incidents)
         
         # Split documents into chunks
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
+
         text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=1000,
             chunk_overlap=200
@@ -51,10 +75,7 @@ class VectorSearchService:
         texts = text_splitter.create_documents(documents)
         
         # Create or update vector store
-        if self.vector_store is None:
-            self.vector_store = FAISS.from_documents(texts, self.embeddings)
-        else:
-            self.vector_store.add_documents(texts)
+        self._add_documents(texts)
     
     def search_similar_incidents(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
         """Search for similar incidents"""
@@ -62,7 +83,8 @@ class VectorSearchService:
             self.build_index()
         
         # Search for similar documents
-        docs = self.vector_store.similarity_search(query, k=k)
+        with FAISS_SEARCH_LATENCY.time():
+            docs = self.vector_store.similarity_search(query, k=k)
         
         # Extract incident IDs from the documents
         incident_ids = []
@@ -74,10 +96,11 @@ class VectorSearchService:
         
         # Fetch full incident details from DynamoDB
         similar_incidents = []
-        for incident_id in incident_ids:
-            response = self.table.get_item(Key={'IncidentId': incident_id})
-            if 'Item' in response:
-                similar_incidents.append(response['Item'])
+        with DYNAMODB_HYDRATION_LATENCY.time():
+            for incident_id in incident_ids:
+                response = self.table.get_item(Key={'IncidentId': incident_id})
+                if 'Item' in response:
+                    similar_incidents.append(response['Item'])
         
         return similar_incidents
     
@@ -89,16 +112,26 @@ class VectorSearchService:
         
         # Update vector store
         documents = self._prepare_documents([incident])
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
+
         text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=1000,
             chunk_overlap=200
         )
         texts = text_splitter.create_documents(documents)
-        
-        if self.vector_store is None:
-            self.vector_store = FAISS.from_documents(texts, self.embeddings)
-        else:
-            self.vector_store.add_documents(texts)
+        self._add_documents(texts)
+    
+    def _add_documents(self, texts: List[Any]):
+        """Add documents to the live store, capturing them for a running rebuild"""
+        from langchain.vectorstores import FAISS
+
+        with self.write_lock:
+            if self.vector_store is None:
+                self.vector_store = FAISS.from_documents(texts, self.embeddings)
+            else:
+                self.vector_store.add_documents(texts)
+            if self.captured_writes is not None:
+                self.captured_writes.extend(texts)
     
     def update_incident(self, incident_id: str, updates: Dict[str, Any]):
         """Update an incident in both DynamoDB and vector store"""
@@ -0,0 +1,112 @@
+from typing import Dict, Any, Callable, List, Optional
+from datetime import datetime
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+MAX_BACKOFF_SECONDS = 60.0
+
+class StartupState:
+    """Track staged startup so liveness and readiness can be reported apart.
+
+    The process is live as soon as it can serve requests. It is ready once
+    every required stage has completed. Background stages (such as model
+    warmup) run on a daemon thread and only gate readiness when marked
+    required. Failed stages are retried with exponential backoff; a required
+    stage that still fails marks the process unhealthy.
+    """
+
+    def __init__(self, process_start: Optional[float] = None):
+        self.process_start = process_start or time.time()
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.required: List[str] = []
+        self.ready_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def run_stage(self, name: str, fn: Callable[[], Any], required: bool = True,
+                  attempts: int = 1, backoff_seconds: float = 1.0) -> Any:
+        """Run ``fn`` as a named stage, recording its duration and outcome.
+
+        A failing stage is retried up to ``attempts`` times in total, waiting
+        ``backoff_seconds`` before the first retry and doubling after each one.
+        """
+        with self._lock:
+            if required and name not in self.required:
+                self.required.append(name)
+            self.stages[name] = {"status": "running", "required": required, "started_at": time.time()}
+        begin = time.perf_counter()
+        delay = backoff_seconds
+        result, status, error = None, "failed", None
+        for attempt in range(1, max(1, attempts) + 1):
+            try:
+                result = fn()
+                status, error = "completed", None
+                break
+            except Exception as e:
+                error = str(e)
+                logger.error(f"Startup stage {name} failed (attempt {attempt}/{attempts}): {error}")
+                if attempt >= attempts:
+                    break
+                with self._lock:
+                    self.stages[name].update({"status": "retrying", "attempts": attempt, "error": error})
+                time.sleep(delay)
+                delay = min(delay * 2, MAX_BACKOFF_SECONDS)
+        with self._lock:
+            self.stages[name].update({
+                "status": status,
+                "attempts": attempt,
+                "duration_seconds": time.perf_counter() - begin,
+                "error": error
+            })
+            if self.ready_at is None and self._all_required_completed():
+                self.ready_at = time.time()
+                logger.info(f"Ready {self.ready_at - self.process_start:.2f}s after process start")
+        return result
+
+    def run_in_background(self, name: str, fn: Callable[[], Any], required: bool = False,
+                          attempts: int = 1, backoff_seconds: float = 1.0) -> threading.Thread:
+        """Run a stage on a daemon thread; required ones gate readiness from now on"""
+        with self._lock:
+            if required and name not in self.required:
+                self.required.append(name)
+            self.stages[name] = {"status": "pending", "required": required}
+        thread = threading.Thread(
+            target=lambda: self.run_stage(name, fn, required=required,
+                                          attempts=attempts, backoff_seconds=backoff_seconds),
+            name=f"startup-{name}",
+            daemon=True
+        )
+        thread.start()
+        return thread
+
+    @property
+    def ready(self) -> bool:
+        return self.ready_at is not None
+
+    @property
+    def healthy(self) -> bool:
+        """False once a required stage has used up its retries.
+
+        Such a process can never become ready, so liveness reports it and
+        the orchestrator restarts it instead of leaving it NotReady forever.
+        """
+        return not any(
+            self.stages.get(name, {}).get("status") == "failed" for name in self.required
+        )
+
+    def _all_required_completed(self) -> bool:
+        return bool(self.required) and all(
+            self.stages.get(name, {}).get("status") == "completed" for name in self.required
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "healthy": self.healthy,
+            "process_started_at": datetime.utcfromtimestamp(self.process_start).isoformat(),
+            "time_to_ready_seconds": self.ready_at - self.process_start if self.ready else None,
+            "uptime_seconds": time.time() - self.process_start,
+            "stages": {name: dict(stage) for name, stage in self.stages.items()}
+        }
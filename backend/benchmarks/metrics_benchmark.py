@@ -0,0 +1,56 @@
+"""Benchmark the per-sample cost of in-process metrics recording.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.metrics_benchmark --samples 1000000 --threads 1 4
+"""
+from typing import Dict, Any
+import argparse
+import json
+import threading
+import time
+
+from app.services.metrics import MetricsRegistry
+
+def run(n_samples: int, n_threads: int) -> Dict[str, Any]:
+    registry = MetricsRegistry()
+    histogram = registry.histogram("bench_latency_seconds", "Benchmark histogram")
+    counter = registry.counter("bench_events_total", "Benchmark counter")
+
+    def observe_loop():
+        observe = histogram.observe
+        for i in range(n_samples):
+            observe(0.0001 * (i % 1000))
+
+    def inc_loop():
+        inc = counter.inc
+        for _ in range(n_samples):
+            inc()
+
+    results = {"samples_per_thread": n_samples, "threads": n_threads}
+    for name, target in (("histogram_observe", observe_loop), ("counter_inc", inc_loop)):
+        threads = [threading.Thread(target=target) for _ in range(n_threads)]
+        begin = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - begin
+        results[f"{name}_ns_per_sample"] = elapsed / (n_samples * n_threads) * 1e9
+
+    # No samples may be lost without locks
+    results["histogram_count_exact"] = sum(histogram._totals()[:-1]) == n_samples * n_threads
+    results["counter_exact"] = counter.value() == n_samples * n_threads
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=1000000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4])
+    args = parser.parse_args()
+
+    for n_threads in args.threads:
+        print(json.dumps(run(args.samples, n_threads)))
+
+if __name__ == "__main__":
+    main()
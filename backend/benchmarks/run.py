@@ -0,0 +1,406 @@
+"""End-to-end benchmark of the retrieval and analysis paths.
+
+Generates a synthetic corpus, stubs AWS services locally and measures index
+build time, query latency (p50/p99), QPS, peak Python heap and import time
+per component, plus the process's peak RSS. Results are written as JSON so runs can be compared.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.run --incidents 2000 --queries 200 --output results.json
+    python -m benchmarks.run --baseline results.json --threshold 0.2
+"""
+from typing import List, Dict, Any, Callable
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+
+from benchmarks.synthetic import SyntheticCorpus, to_dynamodb_item
+from benchmarks.stubs import StubTable, stub_aws, stub_embeddings
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_TARGETS = [
+    "agents.incident_agent",
+    "knowledge_base.knowledge_base",
+    "app.services.vector_search",
+    "app.services.bert_embeddings",
+    "app.api.vector_search",
+    "main",
+]
+
+# Metrics where a larger value is an improvement; everything else is a cost
+HIGHER_IS_BETTER = {"qps", "hit_qps", "miss_qps", "hit_ratio"}
+
+def latency_stats(latencies: List[float]) -> Dict[str, float]:
+    values = np.asarray(latencies)
+    return {
+        "query_p50_ms": float(np.percentile(values, 50) * 1000),
+        "query_p99_ms": float(np.percentile(values, 99) * 1000),
+        "qps": float(len(values) / values.sum()) if values.sum() else 0.0
+    }
+
+def timed_queries(fn: Callable[[Any], Any], queries: List[Any]) -> List[float]:
+    latencies = []
+    for query in queries:
+        begin = time.perf_counter()
+        fn(query)
+        latencies.append(time.perf_counter() - begin)
+    return latencies
+
+def peak_python_heap_mb(fn: Callable[[], Any]) -> float:
+    """Peak Python heap allocated while running ``fn``.
+
+    tracemalloc only sees allocations made through Python's allocator, so
+    native memory held by FAISS, torch or BLAS is not included; see
+    ``peak_rss_mb`` for the whole process.
+    """
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+def peak_rss_mb() -> float:
+    """High-water resident set size of this process, native memory included"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def measure_import(module: str) -> Dict[str, Any]:
+    """Time a cold import of ``module`` in a fresh interpreter"""
+    code = (
+        "import time; t = time.perf_counter(); "
+        f"import {module}; print(time.perf_counter() - t)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()
+        return {"skipped": error[-1] if error else "import failed"}
+    return {"import_seconds": float(result.stdout.strip().splitlines()[-1])}
+
+def measure_startup(timeout: float = 120.0) -> Dict[str, Any]:
+    """Start the API under uvicorn and time until it is live and ready"""
+    import socket
+    import urllib.error
+    import urllib.request
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    env = {
+        **os.environ,
+        "AWS_DEFAULT_REGION": os.environ.get("AWS_DEFAULT_REGION", "us-west-2"),
+        "AWS_ACCESS_KEY_ID": os.environ.get("AWS_ACCESS_KEY_ID", "benchmark"),
+        "AWS_SECRET_ACCESS_KEY": os.environ.get("AWS_SECRET_ACCESS_KEY", "benchmark"),
+    }
+    begin = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+    results: Dict[str, Any] = {}
+    try:
+        while time.perf_counter() - begin < timeout:
+            if process.poll() is not None:
+                error = process.stderr.read().decode().strip().splitlines()
+                return {"skipped": error[-1] if error else "server exited"}
+            for path, key in (("/api/health/live", "time_to_live_seconds"), ("/api/health/ready", "time_to_ready_seconds")):
+                if key in results:
+                    continue
+                try:
+                    with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=1) as response:
+                        results[key] = time.perf_counter() - begin
+                        if key == "time_to_ready_seconds":
+                            state = json.loads(response.read())
+                            results["app_import_seconds"] = state["import_seconds"]
+                            results["app_time_to_ready_seconds"] = state["time_to_ready_seconds"]
+                except (urllib.error.URLError, ConnectionError, OSError):
+                    pass
+            if "time_to_ready_seconds" in results:
+                return results
+            time.sleep(0.05)
+        return {**results, "skipped": f"not ready after {timeout}s"}
+    finally:
+        process.terminate()
+        process.wait()
+
+def bench_knowledge_base(incidents: List[Dict[str, Any]], queries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    from knowledge_base.knowledge_base import KnowledgeBase
+    from knowledge_base.storage import KnowledgeBaseStore
+
+    with tempfile.TemporaryDirectory() as directory:
+        def build() -> KnowledgeBase:
+            kb = KnowledgeBase(KnowledgeBaseStore(directory))
+            for incident in incidents:
+                kb.add_entry(incident["id"], incident, {"category": incident["severity"]})
+            kb._ensure_vectors()
+            return kb
+
+        begin = time.perf_counter()
+        kb = build()
+        build_seconds = time.perf_counter() - begin
+        latencies = timed_queries(kb.search_similar_incidents, queries)
+        kb.close()
+
+        begin = time.perf_counter()
+        reloaded = KnowledgeBase(KnowledgeBaseStore(directory))
+        reloaded.search_similar_incidents(queries[0])
+        reload_seconds = time.perf_counter() - begin
+        reloaded.close()
+
+    with tempfile.TemporaryDirectory() as directory:
+        memory = peak_python_heap_mb(lambda: build().close())
+
+    return {
+        "index_build_seconds": build_seconds,
+        "reload_seconds": reload_seconds,
+        "peak_python_heap_mb": memory,
+        **latency_stats(latencies)
+    }
+
+def _bench_vector_index(search: Any, rebuilder_kwargs: Dict[str, Any], queries: List[str]) -> Dict[str, Any]:
+    from app.services.index_rebuilder import IndexRebuilder, RebuildJob, RebuildStatus
+
+    with tempfile.TemporaryDirectory() as directory:
+        def build():
+            rebuilder = IndexRebuilder("bench", search, checkpoint_dir=directory, **rebuilder_kwargs)
+            job = RebuildJob("bench")
+            rebuilder._run(job)
+            if job.status != RebuildStatus.COMPLETED:
+                raise RuntimeError(job.error)
+
+        begin = time.perf_counter()
+        build()
+        build_seconds = time.perf_counter() - begin
+        memory = peak_python_heap_mb(build)
+
+    latencies = timed_queries(lambda query: search.search_similar_incidents(query, k=5), queries)
+    return {"index_build_seconds": build_seconds, "peak_python_heap_mb": memory, **latency_stats(latencies)}
+
+def bench_vector_search(table: StubTable, queries: List[str], real_models: bool) -> Dict[str, Any]:
+    from app.services.vector_search import VectorSearchService
+
+    with stub_aws(table):
+        if real_models:
+            search = VectorSearchService()
+        else:
+            with stub_embeddings("langchain.embeddings.HuggingFaceEmbeddings"):
+                search = VectorSearchService()
+        return _bench_vector_index(search, {"prepare_texts": search._prepare_texts}, queries)
+
+def bench_bert_search(table: StubTable, queries: List[str], real_models: bool) -> Dict[str, Any]:
+    from app.services.bert_embeddings import BERTVectorSearch
+
+    with stub_aws(table):
+        if real_models:
+            search = BERTVectorSearch()
+        else:
+            with stub_embeddings("app.services.bert_model.BERTEmbeddings"):
+                search = BERTVectorSearch()
+        return _bench_vector_index(search, {}, queries)
+
+class NoDeduplication:
+    """Deduplicator stand-in that puts every incident in a group of its own"""
+
+    def group_of(self, incident_id: Any):
+        return None
+
+    def ingest(self, incident: Dict[str, Any]):
+        from agents.deduplication import IncidentGroup
+
+        return IncidentGroup(str(incident.get("id")), incident, "", 0, time.time()), True
+
+def bench_agent_manager(corpus: SyntheticCorpus, incidents: List[Dict[str, Any]], n_series: int) -> Dict[str, Any]:
+    """Time full analyses and, separately, the deduplicated/memoized path.
+
+    The synthetic incidents share a few templates, so with grouping and
+    agent memory on almost every request is answered without analysis.
+    """
+    from agents.incident_agent import AgentManager
+    from agents.memory import AgentMemory
+
+    dashboard = corpus.dashboard(n_series)
+    logs = corpus.logs(50)
+    requests = [
+        {**incident, "logs": logs, "dashboard_data": dashboard}
+        for incident in incidents
+    ]
+
+    def uncached_manager() -> AgentManager:
+        manager = AgentManager(deduplicator=NoDeduplication())
+        for agent in manager.agents.values():
+            # Cosine similarity never exceeds 1, so nothing is reused
+            agent.memory = AgentMemory(reuse_threshold=2.0)
+        return manager
+
+    def run_all(manager: AgentManager) -> List[Any]:
+        loop = asyncio.new_event_loop()
+        try:
+            outcomes = []
+            for request in requests:
+                begin = time.perf_counter()
+                results = loop.run_until_complete(manager.analyze_incident(request))
+                elapsed = time.perf_counter() - begin
+                cached = any("duplicate_of" in result or "reused_from" in result for result in results)
+                outcomes.append((elapsed, cached))
+            return outcomes
+        finally:
+            loop.close()
+
+    uncached = run_all(uncached_manager())
+    memory = peak_python_heap_mb(lambda: run_all(uncached_manager()))
+
+    cached_manager = AgentManager()
+    outcomes = run_all(cached_manager)
+    hits = [elapsed for elapsed, cached in outcomes if cached]
+    misses = [elapsed for elapsed, cached in outcomes if not cached]
+    return {
+        "peak_python_heap_mb": memory,
+        **latency_stats([elapsed for elapsed, _ in uncached]),
+        "cached": {
+            "hit_ratio": len(hits) / len(outcomes) if outcomes else 0.0,
+            "groups": cached_manager.deduplicator.stats()["active_groups"],
+            **({f"hit_{name}": value for name, value in latency_stats(hits).items()} if hits else {}),
+            **({f"miss_{name}": value for name, value in latency_stats(misses).items()} if misses else {})
+        }
+    }
+
+def bench_analyze_api(queries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    import main
+
+    with stub_aws(StubTable()) as clients:
+        main.bedrock = clients["bedrock-runtime"]
+
+    loop = asyncio.new_event_loop()
+    try:
+        latencies = timed_queries(
+            lambda request: loop.run_until_complete(main.analyze_incident(main.AnalysisRequest(**request))),
+            queries
+        )
+    finally:
+        loop.close()
+    return {"bedrock_calls": clients["bedrock-runtime"].calls, **latency_stats(latencies)}
+
+def run_benchmarks(args: argparse.Namespace) -> Dict[str, Any]:
+    corpus = SyntheticCorpus(seed=args.seed)
+    incidents = corpus.incidents(args.incidents)
+    query_incidents = corpus.incidents(args.queries)
+    text_queries = [f"{incident['title']} {incident['description']}" for incident in query_incidents]
+    table = StubTable([to_dynamodb_item(incident) for incident in incidents])
+
+    components = {
+        "knowledge_base": lambda: bench_knowledge_base(
+            incidents,
+            [{"title": incident["title"], "description": incident["description"]} for incident in query_incidents]
+        ),
+        "vector_search": lambda: bench_vector_search(table, text_queries, args.real_models),
+        "bert_search": lambda: bench_bert_search(table, text_queries, args.real_models),
+        "agent_manager": lambda: bench_agent_manager(corpus, query_incidents, args.series),
+        "analyze_api": lambda: bench_analyze_api([
+            {"incident_id": incident["id"], "data_type": "metrics", "data": incident["metrics"]}
+            for incident in query_incidents
+        ]),
+    }
+
+    results: Dict[str, Any] = {}
+    for name, bench in components.items():
+        if args.only and name not in args.only:
+            continue
+        logging.info(f"Benchmarking {name}")
+        try:
+            results[name] = bench()
+        except ImportError as e:
+            results[name] = {"skipped": f"missing dependency: {str(e)}"}
+        except Exception as e:
+            results[name] = {"skipped": f"{type(e).__name__}: {str(e)}"}
+
+    if not args.skip_imports:
+        results["imports"] = {module: measure_import(module) for module in IMPORT_TARGETS}
+        results["startup"] = measure_startup()
+
+    return {
+        "config": {
+            "incidents": args.incidents,
+            "queries": args.queries,
+            "series": args.series,
+            "real_models": args.real_models,
+            "seed": args.seed
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        },
+        "results": results,
+        "process_peak_rss_mb": peak_rss_mb()
+    }
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Return a description of every metric that regressed beyond ``threshold``"""
+    regressions = []
+    for component, metrics in current["results"].items():
+        base_metrics = baseline.get("results", {}).get(component, {})
+        for metric, value in metrics.items():
+            if isinstance(value, dict):
+                base_value = base_metrics.get(metric, {})
+                pairs = [(f"{metric}.{key}", v, base_value.get(key)) for key, v in value.items()]
+            else:
+                pairs = [(metric, value, base_metrics.get(metric))]
+            for name, new, old in pairs:
+                if not isinstance(new, (int, float)) or not isinstance(old, (int, float)) or not old:
+                    continue
+                change = (new - old) / old
+                if name.split(".")[-1] in HIGHER_IS_BETTER:
+                    change = -change
+                if change > threshold:
+                    regressions.append(f"{component}.{name}: {old:.4g} -> {new:.4g} ({change:+.1%})")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--incidents", type=int, default=1000, help="corpus size")
+    parser.add_argument("--queries", type=int, default=100, help="queries per component")
+    parser.add_argument("--series", type=int, default=200, help="dashboard series per incident")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="+", help="components to run")
+    parser.add_argument("--real-models", action="store_true", help="load HuggingFace/BERT models instead of hashing embeddings")
+    parser.add_argument("--skip-imports", action="store_true", help="skip cold import timing")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative regression")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    logging.getLogger("agents").setLevel(logging.WARNING)
+    report = run_benchmarks(args)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""In-process stand-ins for DynamoDB, CloudWatch, Bedrock and embedding models."""
+from typing import List, Dict, Any, Iterator
+from contextlib import contextmanager, ExitStack
+from unittest import mock
+import io
+import json
+
+from agents.memory import hashed_embedding
+
+try:
+    from langchain.embeddings.base import Embeddings
+except ImportError:
+    # Only the vector search benchmarks need langchain
+    Embeddings = object
+
+class StubTable:
+    def __init__(self, items: List[Dict[str, Any]] = None):
+        self.items: Dict[str, Dict[str, Any]] = {}
+        for item in items or []:
+            self.put_item(Item=item)
+
+    def scan(self, **kwargs) -> Dict[str, Any]:
+        return {"Items": list(self.items.values())}
+
+    def get_item(self, Key: Dict[str, Any]) -> Dict[str, Any]:
+        item = self.items.get(Key["IncidentId"])
+        return {"Item": item} if item is not None else {}
+
+    def put_item(self, Item: Dict[str, Any]) -> Dict[str, Any]:
+        self.items[Item["IncidentId"]] = dict(Item)
+        return {}
+
+    def update_item(self, Key: Dict[str, Any], ExpressionAttributeValues: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        item = self.items.setdefault(Key["IncidentId"], dict(Key))
+        item.update({name[1:]: value for name, value in ExpressionAttributeValues.items()})
+        return {}
+
+class StubDynamoDB:
+    def __init__(self, table: StubTable):
+        self.table = table
+
+    def Table(self, name: str) -> StubTable:
+        return self.table
+
+class StubCloudWatch:
+    def __init__(self):
+        self.metric_data: List[Dict[str, Any]] = []
+
+    def put_metric_data(self, Namespace: str, MetricData: List[Dict[str, Any]]):
+        self.metric_data.extend(MetricData)
+
+class StubBedrock:
+    def __init__(self, completion: str = "Root cause: synthetic. Impact: synthetic. Actions: none."):
+        self.completion = completion
+        self.calls = 0
+
+    def invoke_model(self, modelId: str, body: str) -> Dict[str, Any]:
+        self.calls += 1
+        payload = json.dumps({"completion": self.completion}).encode("utf-8")
+        return {"body": io.BytesIO(payload)}
+
+class HashingEmbeddings(Embeddings):
+    """Deterministic feature-hashing embeddings, used in place of model downloads"""
+
+    def __init__(self, model_type: Any = None, dim: int = 384, **kwargs):
+        self.model_type = model_type
+        self.dim = dim
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [hashed_embedding(text, self.dim).tolist() for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return hashed_embedding(text, self.dim).tolist()
+
+@contextmanager
+def stub_aws(table: StubTable) -> Iterator[Dict[str, Any]]:
+    """Route boto3 clients and resources to local stubs"""
+    clients = {
+        "cloudwatch": StubCloudWatch(),
+        "bedrock-runtime": StubBedrock(),
+        "dynamodb": StubDynamoDB(table)
+    }
+
+    def factory(service_name: str, *args, **kwargs):
+        return clients.get(service_name, mock.MagicMock())
+
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch("boto3.client", side_effect=factory))
+        stack.enter_context(mock.patch("boto3.resource", side_effect=factory))
+        yield clients
+
+@contextmanager
+def stub_embeddings(target: str) -> Iterator[None]:
+    """Replace a model-loading embeddings class (e.g. HuggingFace, BERT) with HashingEmbeddings"""
+    with mock.patch(target, HashingEmbeddings):
+        yield
@@ -0,0 +1,116 @@
+"""Synthetic incident, log and metric corpora shaped like ``test_data``."""
+from typing import List, Dict, Any, Tuple
+from datetime import datetime, timedelta
+import json
+import os
+import random
+import re
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "test_data")
+
+_LOG_LINE = re.compile(r"^(\S+) (\w+) \[(\w+)\] (.*)$")
+_METRIC_NAME = re.compile(r"^([a-zA-Z_:][a-zA-Z0-9_:]*)")
+
+def _load_templates() -> Tuple[List[Dict[str, Any]], List[Tuple[str, str]], List[str]]:
+    with open(os.path.join(TEST_DATA_DIR, "incidents", "incidents.json")) as f:
+        incidents = json.load(f)["incidents"]
+
+    log_templates = []
+    with open(os.path.join(TEST_DATA_DIR, "logs", "sample_app.log")) as f:
+        for line in f:
+            match = _LOG_LINE.match(line.strip())
+            if match:
+                log_templates.append((match.group(2), match.group(4)))
+
+    metric_names = []
+    with open(os.path.join(TEST_DATA_DIR, "metrics", "prometheus_metrics.txt")) as f:
+        for line in f:
+            match = _METRIC_NAME.match(line)
+            if match and match.group(1) not in metric_names:
+                metric_names.append(match.group(1))
+
+    return incidents, log_templates, metric_names
+
+class SyntheticCorpus:
+    """Generate incidents, logs and metric series at a configurable scale.
+
+    Records follow the field layout of the files under ``test_data`` with
+    volatile values (ids, numbers, services, times) randomized.
+    """
+
+    def __init__(self, seed: int = 0, start: datetime = datetime(2024, 3, 20, 10, 0, 0)):
+        self.rng = random.Random(seed)
+        self.start = start
+        self.incident_templates, self.log_templates, self.metric_names = _load_templates()
+        self.services = sorted({
+            service
+            for incident in self.incident_templates
+            for service in incident.get("affected_services", [])
+        })
+        self.hosts = [f"node-{i}" for i in range(1, 51)]
+
+    def incidents(self, n: int) -> List[Dict[str, Any]]:
+        results = []
+        for i in range(n):
+            template = self.rng.choice(self.incident_templates)
+            timestamp = self.start + timedelta(seconds=self.rng.randint(0, 30 * 86400))
+            host = self.rng.choice(self.hosts)
+            services = self.rng.sample(self.services, k=self.rng.randint(1, min(2, len(self.services))))
+            results.append({
+                **template,
+                "id": f"INC-{i + 1:06d}",
+                "title": f"{template['title']} on {host}",
+                "description": f"{template['description']} ({self.rng.randint(1, 9999)} occurrences on {host})",
+                "timestamp": timestamp.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "affected_services": services,
+                "metrics": {
+                    name: round(value * self.rng.uniform(0.5, 1.5), 2)
+                    for name, value in template.get("metrics", {}).items()
+                }
+            })
+        return results
+
+    def logs(self, n: int) -> List[Dict[str, Any]]:
+        results = []
+        for i in range(n):
+            level, message = self.rng.choice(self.log_templates)
+            message = re.sub(r"\d+", lambda _: str(self.rng.randint(1, 999)), message)
+            results.append({
+                "timestamp": (self.start + timedelta(seconds=5 * i)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "level": level,
+                "component": self.rng.choice(self.services),
+                "message": message
+            })
+        return results
+
+    def dashboard(self, n_series: int, n_points: int = 120, step_seconds: int = 60) -> Dict[str, Any]:
+        """Dashboard data with an incident start two thirds through the window"""
+        start = self.start.timestamp()
+        incident_start = start + (n_points * 2 // 3) * step_seconds
+        series = {}
+        for i in range(n_series):
+            name = f"{self.metric_names[i % len(self.metric_names)]}{{instance=\"{self.hosts[i % len(self.hosts)]}\",shard=\"{i}\"}}"
+            base = self.rng.uniform(10, 100)
+            shift = self.rng.uniform(0.5, 3.0) * base if i % 10 == 0 else 0.0
+            series[name] = {
+                "timestamps": [start + j * step_seconds for j in range(n_points)],
+                "values": [
+                    base + self.rng.gauss(0, base * 0.05) + (shift if start + j * step_seconds >= incident_start else 0.0)
+                    for j in range(n_points)
+                ]
+            }
+        return {"incident_start": incident_start, "series": series}
+
+def to_dynamodb_item(incident: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a ``test_data`` incident onto the DynamoDB item layout"""
+    return {
+        "IncidentId": incident["id"],
+        "Title": incident.get("title", ""),
+        "Description": incident.get("description", ""),
+        "RootCause": incident.get("root_cause", ""),
+        "Resolution": incident.get("resolution", ""),
+        "Impact": incident.get("impact", ""),
+        "Severity": incident.get("severity", ""),
+        "Status": incident.get("status", ""),
+        "CreatedAt": incident.get("timestamp", "")
+    }
@@ -1,14 +1,25 @@
 from typing import List, Dict, Any, Optional
+import atexit
 import json
 import logging
+import weakref
 from datetime import datetime
 from pydantic import BaseModel
-import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from .storage import KnowledgeBaseStore
+from app.services.metrics import stage_latency
 
 logger = logging.getLogger(__name__)
 
+TFIDF_REFIT_LATENCY = stage_latency("tfidf_refit")
+
+# Open knowledge bases are closed at exit; held weakly so they can still be collected
+_open_knowledge_bases: "weakref.WeakSet[KnowledgeBase]" = weakref.WeakSet()
+
+@atexit.register
+def _close_knowledge_bases():
+    for knowledge_base in list(_open_knowledge_bases):
+        knowledge_base.close()
+
 class KnowledgeEntry(BaseModel):
     id: str
     incident_id: str
@@ -18,27 +29,80 @@ class KnowledgeEntry(BaseModel):
     updated_at: datetime
 
 class KnowledgeBase:
-    def __init__(self):
-        self.entries: List[KnowledgeEntry] = []
-        self.vectorizer = TfidfVectorizer()
+    def __init__(self, store: Optional[KnowledgeBaseStore] = None):
+        self._entries: List[KnowledgeEntry] = []
+        self._positions: Dict[str, int] = {}
+        self._loaded = False
+        self._vectors_dirty = False
+        # Created on first fit so importing the module doesn't load sklearn
+        self.vectorizer = None
         self.vectors = None
-        self._load_knowledge_base()
+        self.store = store or KnowledgeBaseStore()
+        _open_knowledge_bases.add(self)
+
+    @property
+    def entries(self) -> List[KnowledgeEntry]:
+        # Entries are streamed from storage on first use rather than at startup
+        if not self._loaded:
+            self._load_knowledge_base()
+        return self._entries
 
     def _load_knowledge_base(self):
+        self._loaded = True
         try:
-            # Load from persistent storage (implementation needed)
-            pass
+            for entry_id, payload in self.store.iter_records():
+                entry = KnowledgeEntry.model_validate_json(payload)
+                position = self._positions.get(entry_id)
+                if position is None:
+                    self._positions[entry_id] = len(self._entries)
+                    self._entries.append(entry)
+                else:
+                    self._entries[position] = entry
+
+            # Reuse the persisted TF-IDF matrix if it covers every write
+            saved = self.store.load_vectors(self.store.version)
+            if saved is not None:
+                from sklearn.feature_extraction.text import TfidfVectorizer
+
+                vocabulary, idf, self.vectors = saved
+                self.vectorizer = TfidfVectorizer()
+                self.vectorizer.vocabulary_ = vocabulary
+                self.vectorizer.idf_ = idf
+            else:
+                self._vectors_dirty = bool(self._entries)
         except Exception as e:
             logger.error(f"Error loading knowledge base: {str(e)}")
-            self.entries = []
+            self._entries = []
+            self._positions = {}
 
-    def _save_knowledge_base(self):
+    def _save_knowledge_base(self, entry: KnowledgeEntry):
         try:
-            # Save to persistent storage (implementation needed)
-            pass
+            self.store.append(entry.id, entry.model_dump_json())
+            # Vectors are not saved here: they are dirty after any write and
+            # refitting belongs to the next search, not to add_entry
+            if self.store.needs_compaction():
+                self.store.compact()
         except Exception as e:
             logger.error(f"Error saving knowledge base: {str(e)}")
 
+    def _save_vectors(self):
+        self._ensure_vectors()
+        if self.vectors is not None:
+            self.store.flush()
+            self.store.save_vectors(
+                self.store.version, self.vectorizer.vocabulary_, self.vectorizer.idf_, self.vectors
+            )
+
+    def close(self):
+        if self.store.closed:
+            return
+        try:
+            if self._loaded and self._entries:
+                self._save_vectors()
+            self.store.close()
+        except Exception as e:
+            logger.error(f"Error closing knowledge base: {str(e)}")
+
     def add_entry(self, incident_id: str, content: Dict[str, Any], metadata: Dict[str, Any]) -> KnowledgeEntry:
         entry = KnowledgeEntry(
             id=f"kb_{len(self.entries) + 1}",
@@ -48,30 +112,32 @@ class KnowledgeBase:
             created_at=datetime.utcnow(),
             updated_at=datetime.utcnow()
         )
+        self._positions[entry.id] = len(self.entries)
         self.entries.append(entry)
-        self._update_vectors()
-        self._save_knowledge_base()
+        self._vectors_dirty = True
+        self._save_knowledge_base(entry)
         return entry
 
     def update_entry(self, entry_id: str, content: Dict[str, Any], metadata: Dict[str, Any]) -> Optional[KnowledgeEntry]:
-        for entry in self.entries:
-            if entry.id == entry_id:
-                entry.content = content
-                entry.metadata = metadata
-                entry.updated_at = datetime.utcnow()
-                self._update_vectors()
-                self._save_knowledge_base()
-                return entry
-        return None
+        entry = self.get_entry(entry_id)
+        if entry is None:
+            return None
+        entry.content = content
+        entry.metadata = metadata
+        entry.updated_at = datetime.utcnow()
+        self._vectors_dirty = True
+        self._save_knowledge_base(entry)
+        return entry
 
     def get_entry(self, entry_id: str) -> Optional[KnowledgeEntry]:
-        for entry in self.entries:
-            if entry.id == entry_id:
-                return entry
-        return None
+        entries = self.entries
+        position = self._positions.get(entry_id)
+        return entries[position] if position is not None else None
 
     def search_similar_incidents(self, query: Dict[str, Any], top_k: int = 5) -> List[Dict[str, Any]]:
         try:
+            self._ensure_vectors()
+
             # Convert query to text representation
             query_text = self._dict_to_text(query)
             
@@ -79,6 +145,8 @@ class KnowledgeBase:
             query_vector = self.vectorizer.transform([query_text])
             
             # Calculate similarities
+            from sklearn.metrics.pairwise import cosine_similarity
+
             similarities = cosine_similarity(query_vector, self.vectors).flatten()
             
             # Get top k similar entries
@@ -112,6 +180,14 @@ class KnowledgeBase:
                 text_parts.append(f"{key}: {' '.join(str(item) for item in value)}")
         return " ".join(text_parts)
 
+    def _ensure_vectors(self):
+        # Refit lazily so a burst of writes costs a single refit
+        if not self._loaded:
+            self._load_knowledge_base()
+        if self._vectors_dirty:
+            self._update_vectors()
+            self._vectors_dirty = False
+
     def _update_vectors(self):
         try:
             # Convert all entries to text
@@ -119,7 +195,11 @@ class KnowledgeBase:
             
             # Fit and transform using TF-IDF
             if texts:
-                self.vectors = self.vectorizer.fit_transform(texts)
+                from sklearn.feature_extraction.text import TfidfVectorizer
+
+                self.vectorizer = TfidfVectorizer()
+                with TFIDF_REFIT_LATENCY.time():
+                    self.vectors = self.vectorizer.fit_transform(texts)
             else:
                 self.vectors = None
         except Exception as e:
@@ -0,0 +1,196 @@
+from typing import Any, Dict, Iterator, Optional, Tuple
+import json
+import logging
+import os
+import sqlite3
+import threading
+import numpy as np
+from app.config import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORAGE_DIR = os.getenv("KNOWLEDGE_BASE_DIR", os.path.join(DATA_DIR, "knowledge_base"))
+
+class KnowledgeBaseStore:
+    """Append-only SQLite log with a periodically compacted snapshot.
+
+    Every write appends a row to ``log``. Rows are committed in batches
+    (after ``flush_every`` writes, or by a timer ``flush_interval`` seconds
+    after the first write of a batch) so the WAL is synced once per batch
+    rather than once per entry, and no batch stays uncommitted for longer
+    than ``flush_interval``. ``compact`` folds the log into the ``snapshot``
+    table, keeping only the latest version of each entry, and truncates the
+    WAL. Readers stream the snapshot followed by the remaining log.
+
+    The database is not shared across hosts: separate backend replicas each
+    keep their own store and do not see each other's entries.
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_STORAGE_DIR,
+        flush_every: int = 64,
+        flush_interval: float = 1.0,
+        compact_every: int = 1000
+    ):
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        self.directory = directory
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.compact_every = compact_every
+        self.vectors_path = os.path.join(directory, "tfidf.npz")
+        self.vocabulary_path = os.path.join(directory, "tfidf_vocabulary.json")
+
+        self._lock = threading.Lock()
+        self.closed = False
+        self._pending = 0
+        self._flush_timer: Optional[threading.Timer] = None
+        self._conn = sqlite3.connect(
+            os.path.join(directory, "knowledge_base.sqlite3"),
+            isolation_level=None,
+            check_same_thread=False,
+            # Another process may hold the write lock for up to one batch
+            timeout=max(5.0, 2 * flush_interval)
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS log (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                entry_id TEXT NOT NULL,
+                payload TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS snapshot (
+                entry_id TEXT PRIMARY KEY,
+                position INTEGER NOT NULL,
+                payload TEXT NOT NULL
+            );
+        """)
+
+    @property
+    def version(self) -> int:
+        """Sequence number of the last write, including uncommitted ones"""
+        row = self._conn.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'log'"
+        ).fetchone()
+        return row[0] if row else 0
+
+    def iter_records(self) -> Iterator[Tuple[str, str]]:
+        """Stream (entry_id, payload) pairs: snapshot first, then the log"""
+        with self._lock:
+            self._flush()
+        for row in self._conn.execute("SELECT entry_id, payload FROM snapshot ORDER BY position"):
+            yield row
+        for row in self._conn.execute("SELECT entry_id, payload FROM log ORDER BY seq"):
+            yield row
+
+    def append(self, entry_id: str, payload: str):
+        with self._lock:
+            if self._pending == 0:
+                self._conn.execute("BEGIN")
+                # Commit the batch even if no further writes arrive
+                self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+            self._conn.execute(
+                "INSERT INTO log (entry_id, payload) VALUES (?, ?)", (entry_id, payload)
+            )
+            self._pending += 1
+            if self._pending >= self.flush_every:
+                self._flush()
+
+    def flush(self):
+        with self._lock:
+            if not self.closed:
+                self._flush()
+
+    def log_size(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM log").fetchone()[0]
+
+    def needs_compaction(self) -> bool:
+        return self.log_size() >= self.compact_every
+
+    def compact(self):
+        """Fold the log into the snapshot and truncate the WAL"""
+        with self._lock:
+            self._flush()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("""
+                    INSERT INTO snapshot (entry_id, position, payload)
+                    SELECT entry_id, MIN(seq), (
+                        SELECT latest.payload FROM log AS latest
+                        WHERE latest.entry_id = log.entry_id
+                        ORDER BY latest.seq DESC LIMIT 1
+                    )
+                    FROM log WHERE true GROUP BY entry_id
+                    ON CONFLICT(entry_id) DO UPDATE SET payload = excluded.payload
+                """)
+                self._conn.execute("DELETE FROM log")
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def save_vectors(self, version: int, vocabulary: Dict[str, int], idf: Any, vectors: Any):
+        """Persist a fitted TF-IDF vocabulary, idf weights and CSR matrix for ``version``.
+
+        Arrays go to an ``.npz`` and the vocabulary to JSON; neither format
+        can execute code when loaded, unlike pickle.
+        """
+        tmp_path = self.vectors_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                version=np.int64(version),
+                idf=np.asarray(idf),
+                data=vectors.data,
+                indices=vectors.indices,
+                indptr=vectors.indptr,
+                shape=np.asarray(vectors.shape, dtype=np.int64)
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        tmp_vocabulary = self.vocabulary_path + ".tmp"
+        with open(tmp_vocabulary, "w") as f:
+            json.dump({"version": version, "vocabulary": {term: int(i) for term, i in vocabulary.items()}}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.vectors_path)
+        os.replace(tmp_vocabulary, self.vocabulary_path)
+
+    def load_vectors(self, version: int) -> Optional[Tuple[Dict[str, int], Any, Any]]:
+        """Return the saved (vocabulary, idf, vectors) if they match ``version``"""
+        if not (os.path.exists(self.vectors_path) and os.path.exists(self.vocabulary_path)):
+            return None
+        from scipy.sparse import csr_matrix
+
+        with open(self.vocabulary_path) as f:
+            saved_vocabulary = json.load(f)
+        with np.load(self.vectors_path, allow_pickle=False) as saved:
+            # Both files must come from the same save
+            if int(saved["version"]) != version or saved_vocabulary.get("version") != version:
+                return None
+            vectors = csr_matrix(
+                (saved["data"], saved["indices"], saved["indptr"]),
+                shape=tuple(saved["shape"])
+            )
+            idf = saved["idf"]
+        return saved_vocabulary["vocabulary"], idf, vectors
+
+    def close(self):
+        with self._lock:
+            if self.closed:
+                return
+            self._flush()
+            self._conn.close()
+            self.closed = True
+
+    def _flush(self):
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if self._pending:
+            self._conn.execute("COMMIT")
+            self._pending = 0
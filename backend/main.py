@@ -1,22 +1,70 @@
-from fastapi import FastAPI, HTTPException, Depends
+import time
+
+PROCESS_START = time.time()
+_import_begin = time.perf_counter()
+
+from fastapi import FastAPI, HTTPException, Depends, Header
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, JSONResponse
 from pydantic import BaseModel
 from typing import List, Optional
-import boto3
+import asyncio
+import hmac
 import json
 import logging
+import os
 from datetime import datetime
 from opentelemetry import trace
-from opentelemetry.instrumentation.fastapi import FastAPIInstrumentation
+from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+from agents.deduplication import AlertDeduplicator, IncidentGroup
+from agents.incident_agent import AgentManager
+from app.api import vector_search as vector_search_api
+from app.services.metrics import REGISTRY, stage_latency, stage_counter
+from app.services.profiler import PROFILER
+from app.startup import StartupState
+
+IMPORT_SECONDS = time.perf_counter() - _import_begin
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize AWS Bedrock client
-bedrock = boto3.client('bedrock-runtime')
+# AWS Bedrock client, created during startup rather than at import
+bedrock = None
+
+def get_bedrock():
+    global bedrock
+    if bedrock is None:
+        import boto3
+        bedrock = boto3.client('bedrock-runtime')
+    return bedrock
+
+BEDROCK_LATENCY = stage_latency("bedrock_invoke")
+BEDROCK_ERRORS = stage_counter("bedrock_errors_total", "Failed Bedrock model invocations")
+
+# The profiler exposes full stacks, so its routes only exist when enabled and
+# require PROFILER_TOKEN as a bearer token when one is configured
+PROFILER_ENABLED = os.getenv("PROFILER_ENABLED", "false").lower() == "true"
+PROFILER_TOKEN = os.getenv("PROFILER_TOKEN")
+
+if PROFILER_ENABLED:
+    PROFILER.start()
+
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "false").lower() == "true"
+# Required stages are retried with exponential backoff before the process
+# reports itself unhealthy and gets restarted
+STARTUP_STAGE_ATTEMPTS = int(os.getenv("STARTUP_STAGE_ATTEMPTS", "5"))
+STARTUP_STAGE_BACKOFF_SECONDS = float(os.getenv("STARTUP_STAGE_BACKOFF_SECONDS", "2"))
+
+startup_state = StartupState(process_start=PROCESS_START)
 
 app = FastAPI(title="SRE Copilot API")
+app.include_router(vector_search_api.router, prefix="/api/v1/vector-search", tags=["vector-search"])
+
+# Groups near-duplicate incidents so alert storms are analyzed once; the
+# agents share it so an incident is grouped the same way everywhere
+incident_deduplicator = AlertDeduplicator()
+agent_manager = AgentManager(deduplicator=incident_deduplicator)
 
 # Add CORS middleware
 app.add_middleware(
@@ -28,7 +76,23 @@ app.add_middleware(
 )
 
 # Initialize OpenTelemetry
-FastAPIInstrumentation.instrument(app)
+FastAPIInstrumentor.instrument_app(app)
+
+@app.on_event("startup")
+async def staged_startup():
+    logger.info(f"Application modules imported in {IMPORT_SECONDS:.2f}s")
+    # With warmup on, models load off the event loop and the pod only turns
+    # ready once they are in memory; without it queries load them lazily
+    if WARMUP_ENABLED:
+        startup_state.run_in_background(
+            "model_warmup", vector_search_api.warmup, required=True,
+            attempts=STARTUP_STAGE_ATTEMPTS, backoff_seconds=STARTUP_STAGE_BACKOFF_SECONDS
+        )
+    # Retries sleep between attempts, so they run off the event loop too
+    startup_state.run_in_background(
+        "aws_clients", get_bedrock, required=True,
+        attempts=STARTUP_STAGE_ATTEMPTS, backoff_seconds=STARTUP_STAGE_BACKOFF_SECONDS
+    )
 
 class Incident(BaseModel):
     id: str
@@ -55,49 +119,96 @@ class AgentResponse(BaseModel):
 @app.post("/api/incidents")
 async def create_incident(incident: Incident):
     try:
+        group, is_new = incident_deduplicator.ingest(incident.dict())
         # Store incident in database (implementation needed)
-        return {"message": "Incident created successfully", "incident_id": incident.id}
+        return {
+            "message": "Incident created successfully" if is_new else "Incident grouped with existing incident",
+            "incident_id": incident.id,
+            "duplicate": not is_new,
+            "group": group.to_dict()
+        }
     except Exception as e:
         logger.error(f"Error creating incident: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _group_fields(group: IncidentGroup, incident_id: str) -> dict:
+    fields = {"group_id": group.group_id}
+    if group.representative.get("id") != incident_id:
+        fields["duplicate_of"] = group.representative.get("id")
+    return fields
+
 @app.post("/api/analyze")
 async def analyze_incident(request: AnalysisRequest):
+    # Bedrock is called once per incident group and data type; grouped
+    # incidents get the cached result
+    group = incident_deduplicator.group_of(request.incident_id)
+    if group is not None:
+        pending = group.llm_analyses.get(request.data_type)
+        if pending is not None:
+            try:
+                analysis = await asyncio.shield(pending)
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=str(e))
+            return {
+                "incident_id": request.incident_id,
+                "analysis": analysis,
+                "timestamp": datetime.utcnow(),
+                **_group_fields(group, request.incident_id)
+            }
+        pending = group.llm_analyses[request.data_type] = asyncio.get_running_loop().create_future()
+
     try:
-        # Prepare prompt for AWS Bedrock
-        prompt = f"""
-        Analyze the following {request.data_type} data for incident {request.incident_id}:
-        {json.dumps(request.data, indent=2)}
-        
-        Please provide:
-        1. Root cause analysis
-        2. Impact assessment
-        3. Recommended actions
-        """
-        
-        # Call AWS Bedrock
-        response = bedrock.invoke_model(
-            modelId='anthropic.claude-v2',
-            body=json.dumps({
-                "prompt": prompt,
-                "max_tokens": 1000,
-                "temperature": 0.7
-            })
-        )
-        
-        # Parse response
-        response_body = json.loads(response['body'].read())
-        analysis = response_body['completion']
-        
-        return {
-            "incident_id": request.incident_id,
-            "analysis": analysis,
-            "timestamp": datetime.utcnow()
-        }
+        analysis = _invoke_bedrock(request)
     except Exception as e:
         logger.error(f"Error analyzing incident: {str(e)}")
+        if group is not None:
+            # Let the next request for this group retry
+            group.llm_analyses.pop(request.data_type, None)
+            pending.set_exception(e)
+            pending.exception()
         raise HTTPException(status_code=500, detail=str(e))
 
+    result = {
+        "incident_id": request.incident_id,
+        "analysis": analysis,
+        "timestamp": datetime.utcnow()
+    }
+    if group is not None:
+        pending.set_result(analysis)
+        result.update(_group_fields(group, request.incident_id))
+    return result
+
+def _invoke_bedrock(request: AnalysisRequest) -> str:
+    # Prepare prompt for AWS Bedrock
+    prompt = f"""
+    Analyze the following {request.data_type} data for incident {request.incident_id}:
+    {json.dumps(request.data, indent=2)}
+    
+    Please provide:
+    1. Root cause analysis
+    2. Impact assessment
+    3. Recommended actions
+    """
+    
+    # Call AWS Bedrock
+    try:
+        with BEDROCK_LATENCY.time():
+            response = get_bedrock().invoke_model(
+                modelId='anthropic.claude-v2',
+                body=json.dumps({
+                    "prompt": prompt,
+                    "max_tokens": 1000,
+                    "temperature": 0.7
+                })
+            )
+    except Exception:
+        BEDROCK_ERRORS.inc()
+        raise
+    
+    # Parse response
+    response_body = json.loads(response['body'].read())
+    return response_body['completion']
+
 @app.get("/api/incidents/{incident_id}")
 async def get_incident(incident_id: str):
     try:
@@ -107,19 +218,55 @@ async def get_incident(incident_id: str):
         logger.error(f"Error retrieving incident: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/metrics")
+@app.get("/api/metrics", response_class=PlainTextResponse)
 async def get_metrics():
     try:
-        # Implement metrics collection
-        return {"message": "Metrics endpoint"}
+        # Prometheus text exposition format
+        return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
     except Exception as e:
         logger.error(f"Error retrieving metrics: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def require_profiler_token(authorization: Optional[str] = Header(default=None)):
+    if PROFILER_TOKEN and not hmac.compare_digest(authorization or "", f"Bearer {PROFILER_TOKEN}"):
+        raise HTTPException(status_code=401, detail="Invalid profiler token")
+
+if PROFILER_ENABLED:
+    @app.get("/api/profiler", dependencies=[Depends(require_profiler_token)])
+    async def get_profiler(format: str = "status"):
+        if format == "collapsed":
+            return PlainTextResponse(PROFILER.collapsed())
+        return PROFILER.status()
+
+    @app.post("/api/profiler/{action}", dependencies=[Depends(require_profiler_token)])
+    async def toggle_profiler(action: str):
+        if action == "start":
+            PROFILER.start()
+        elif action == "stop":
+            PROFILER.stop()
+        else:
+            raise HTTPException(status_code=400, detail=f"Unknown profiler action: {action}")
+        return PROFILER.status()
+
 @app.get("/api/health")
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/api/health/live")
+async def liveness_check():
+    # A required stage that exhausted its retries will never turn the pod
+    # ready, so fail liveness and let it be restarted
+    if not startup_state.healthy:
+        return JSONResponse(status_code=503, content={"status": "failed", **startup_state.to_dict()})
+    return {"status": "alive"}
+
+@app.get("/api/health/ready")
+async def readiness_check():
+    state = {**startup_state.to_dict(), "import_seconds": IMPORT_SECONDS}
+    if not startup_state.ready:
+        return JSONResponse(status_code=503, content={"status": "starting", **state})
+    return {"status": "ready", **state}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file